@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# tracemalloc benchmark: peak Python heap per chart render, list-based payload vs PriceArrays
+from __future__ import annotations
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from price_arrays import PriceArrays, js_number_array
+from unh_static_chart import LAST_KNOWN, YEAR_END, build_chart_html
+
+def synthetic_history(days: int, seed: int) -> pd.DataFrame:
+    """yfinance-shaped OHLCV frame (float64, tz-aware index)."""
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=pd.Timestamp(LAST_KNOWN), periods=days, tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99,
+                         "Close": close, "Volume": rng.integers(1e6, 1e7, days).astype(float)}, index=idx)
+
+def render_lists(df: pd.DataFrame) -> str:
+    """The pre-PriceArrays path: Close copy, string dates, float lists, json.dumps."""
+    px = df[["Close"]].copy()
+    px.index = px.index.tz_localize(None)
+    dates = [ts.strftime("%Y-%m-%d") for ts in px.index]
+    closes = [float(x) for x in px["Close"].tolist()]
+    future = pd.date_range(LAST_KNOWN, YEAR_END, freq="D")[1:]
+    return "".join([json.dumps(dates), json.dumps([float(x) for x in closes]),
+                    json.dumps([d.strftime("%Y-%m-%d") for d in future]),
+                    json.dumps([closes[-1]] * len(future))])
+
+def render_arrays(df: pd.DataFrame) -> str:
+    """Same payload from PriceArrays (stub days are generated in the page)."""
+    prices = PriceArrays.from_frame(df, "Close")
+    return js_number_array(prices.days, "%d") + js_number_array(prices.close, "%.2f")
+
+def render_chart(df: pd.DataFrame) -> str:
+    """Full page via build_chart_html."""
+    return build_chart_html(PriceArrays.from_frame(df, "Close"), LAST_KNOWN, YEAR_END, [], [], [], [])
+
+def measure(render: Callable[[pd.DataFrame], str], frames: list[pd.DataFrame]) -> tuple[int, int]:
+    """(max peak for a single chart, peak across rendering all charts and keeping the HTML)."""
+    per_chart = 0
+    for df in frames:
+        gc.collect()
+        tracemalloc.start()
+        render(df)
+        per_chart = max(per_chart, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    gc.collect()
+    tracemalloc.start()
+    pages = [render(df) for df in frames]
+    total = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del pages
+    return per_chart, total
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Peak Python heap per chart (tracemalloc)")
+    parser.add_argument("--charts", type=int, default=200)
+    parser.add_argument("--days", type=int, default=2520, help="trading days per chart (~10y)")
+    args = parser.parse_args()
+
+    frames = [synthetic_history(args.days, seed) for seed in range(args.charts)]
+    print(f"{args.charts} charts × {args.days} bars")
+    print(f"{'pipeline':<10} {'peak/chart':>12} {'peak all charts':>17}")
+    for name, fn in (("lists", render_lists), ("arrays", render_arrays), ("full page", render_chart)):
+        one, total = measure(fn, frames)
+        print(f"{name:<10} {one / 1024:>10,.0f}KB {total / 2**20:>15,.1f}MB")
+    print("(lists/arrays: price payload only; full page: build_chart_html from PriceArrays)")
+
+if __name__ == "__main__":
+    main()
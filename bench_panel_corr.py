@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# Scaling benchmark for panel_analytics.correlation_matrix: universe size × worker count
+from __future__ import annotations
+import argparse
+import os
+import resource
+import time
+
+import numpy as np
+
+from panel_analytics import BLOCK, correlation_matrix
+
+def synthetic_returns(days: int, tickers: int, seed: int = 0) -> np.ndarray:
+    """One-factor returns with ~2% missing bars, float32 (T, N)."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, (days, 1)).astype(np.float32)
+    beta = rng.uniform(0.2, 1.5, (1, tickers)).astype(np.float32)
+    rets = market * beta + rng.normal(0, 0.015, (days, tickers)).astype(np.float32)
+    rets[rng.random((days, tickers)) < 0.02] = np.nan
+    return rets
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Correlation matrix run time vs universe size and cores")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 3000])
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--days", type=int, default=756, help="trading days (~3y)")
+    parser.add_argument("--block", type=int, default=BLOCK)
+    args = parser.parse_args()
+
+    print(f"T={args.days} days, block={args.block}, cpus={os.cpu_count()}")
+    print(f"{'tickers':>8} {'workers':>8} {'seconds':>9} {'speedup':>8} {'result MB':>10}")
+    for n in args.sizes:
+        rets = synthetic_returns(args.days, n)
+        base = None
+        for w in args.workers:
+            t0 = time.perf_counter()
+            corr = correlation_matrix(rets, block=args.block, workers=w)
+            dt = time.perf_counter() - t0
+            base = base or dt
+            print(f"{n:>8} {w:>8} {dt:>9.2f} {base / dt:>7.1f}x {corr.nbytes / 2**20:>10.1f}")
+            del corr
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak RSS (parent): {peak:,.0f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Content-hash incremental builds for generated chart artifacts
+from __future__ import annotations
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+# ---------- CONFIG ----------
+MANIFEST_PATH = Path(".chart_manifest.json")
+# ----------------------------
+
+def _feed(h: "hashlib._Hash", obj: Any) -> None:
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"df")
+        _feed(h, list(obj.columns))
+        _feed(h, obj.index.values)
+        for c in obj.columns:
+            _feed(h, obj[c].to_numpy())
+    elif isinstance(obj, pd.Series):
+        h.update(b"series")
+        _feed(h, obj.index.values)
+        _feed(h, obj.to_numpy())
+    elif isinstance(obj, pd.Index):
+        _feed(h, obj.values)
+    elif isinstance(obj, np.ndarray) and obj.dtype != object:
+        arr = np.ascontiguousarray(obj)
+        h.update(f"nd:{arr.dtype.str}:{arr.shape}".encode())
+        h.update(arr.tobytes())
+    else:
+        if isinstance(obj, np.ndarray):
+            obj = obj.tolist()
+        h.update(json.dumps(obj, sort_keys=True, default=str).encode("utf-8"))
+    h.update(b"\x00")
+
+def input_hash(*parts: Any) -> str:
+    """SHA-256 over chart inputs: frames, arrays, and JSON-able values, in order."""
+    h = hashlib.sha256()
+    for part in parts:
+        _feed(h, part)
+    return h.hexdigest()
+
+def source_hash(*renderers: Any) -> str:
+    """SHA-256 over the source of the functions/classes/modules that write a chart.
+
+    Goes into the build digest next to the hand-kept template version, so any
+    edit to a renderer invalidates its outputs without a manual bump.
+    """
+    h = hashlib.sha256()
+    for obj in renderers:
+        _feed(h, inspect.getsource(obj))
+    return h.hexdigest()
+
+def load_manifest(manifest_path: Path = MANIFEST_PATH) -> Dict[str, str]:
+    if not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+def is_up_to_date(output: Path, digest: str, manifest_path: Path = MANIFEST_PATH) -> bool:
+    """True if ``output`` exists and was last built from inputs with this digest."""
+    return output.exists() and load_manifest(manifest_path).get(str(output)) == digest
+
+def record_build(output: Path, digest: str, manifest_path: Path = MANIFEST_PATH) -> None:
+    manifest = load_manifest(manifest_path)
+    manifest[str(output)] = digest
+    tmp = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, manifest_path)
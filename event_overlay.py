@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Company/macro event overlay for the price charts (sorted-array join onto the price index)
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from price_arrays import PriceArrays
+
+# ---------- CONFIG ----------
+EVENTS_DIR = Path("market-context/src/data")
+EVENT_COLUMNS = ["ticker", "id", "date", "title", "eventType"]
+# ----------------------------
+
+def _read_events_file(path: Path) -> List[dict]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return []
+    return raw if isinstance(raw, list) else []
+
+def load_events(data_dir: Path = EVENTS_DIR, tickers: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Load company + macro events into one frame.
+
+    Macro events get ticker=None (they apply to every chart). Company copies of a
+    macro event (``nvda_fomc_...`` written by EventFetcher) are dropped in favour
+    of the macro row so the same meeting is not counted twice on a bar.
+    """
+    wanted = {t.upper() for t in tickers} if tickers is not None else None
+    rows: List[dict] = []
+
+    macro = _read_events_file(data_dir / "macro" / "events.json")
+    macro_ids = {e.get("id") for e in macro}
+    for e in macro:
+        rows.append({"ticker": None, "id": e.get("id"), "date": e.get("date"),
+                     "title": e.get("title", ""), "eventType": e.get("eventType", "")})
+
+    # *_events.json only: skips *_events_seed.json and *_events_added_latest.json
+    for path in sorted((data_dir / "company").glob("*_events.json")):
+        for e in _read_events_file(path):
+            ticker = str(e.get("ticker") or path.name.split("_")[0]).upper()
+            if wanted is not None and ticker not in wanted:
+                continue
+            eid = str(e.get("id", ""))
+            prefix = f"{ticker.lower()}_"
+            if eid.startswith(prefix) and eid[len(prefix):] in macro_ids:
+                continue
+            rows.append({"ticker": ticker, "id": eid, "date": e.get("date"),
+                         "title": e.get("title", ""), "eventType": e.get("eventType", "")})
+
+    df = pd.DataFrame(rows, columns=EVENT_COLUMNS)
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    return df.dropna(subset=["date"]).sort_values("date", kind="stable").reset_index(drop=True)
+
+def events_for_ticker(events: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    mask = events["ticker"].isna() | (events["ticker"] == ticker.upper())
+    return events.loc[mask]
+
+def _bars(prices: Union[PriceArrays, pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+    if isinstance(prices, PriceArrays):
+        return prices.datetimes().astype("datetime64[ns]"), prices.close
+    return prices.index.values.astype("datetime64[ns]"), prices["Close"].to_numpy(dtype=float)
+
+def overlay_events(prices: Union[PriceArrays, pd.DataFrame], events: pd.DataFrame) -> pd.DataFrame:
+    """Snap events onto price bars and aggregate per bar.
+
+    Each event lands on the first bar on/after its date (same rule as
+    ``align_earnings``). Events after the last bar keep their calendar date and
+    sit on the flat projection at the last close with no move. Events before the
+    first bar are dropped. Returns one row per bar:
+    date, price, move, count, titles, types.
+    """
+    out_cols = ["date", "price", "move", "count", "titles", "types"]
+    if events.empty or len(prices) == 0:
+        return pd.DataFrame(columns=out_cols)
+
+    idx, closes = _bars(prices)
+    ev_dates = events["date"].to_numpy(dtype="datetime64[ns]")
+
+    pos = np.searchsorted(idx, ev_dates, side="left")
+    keep = ev_dates >= idx[0]
+    pos, ev_dates = pos[keep], ev_dates[keep]
+    titles = events["title"].to_numpy()[keep]
+    types = events["eventType"].to_numpy()[keep]
+
+    future = pos >= len(idx)
+    bar = np.minimum(pos, len(idx) - 1)
+    prior = np.maximum(bar - 1, 0)
+    price = closes[bar]
+    move = np.where(future, np.nan, closes[bar] - closes[prior])
+    bar_date = np.where(future, ev_dates.astype("datetime64[D]").astype("datetime64[ns]"), idx[bar])
+
+    joined = pd.DataFrame({"date": bar_date, "price": price, "move": move,
+                           "title": titles, "eventType": types})
+    grouped = joined.groupby("date", sort=True)
+    result = grouped.agg(price=("price", "first"), move=("move", "first"),
+                         count=("title", "size"), titles=("title", list),
+                         types=("eventType", list)).reset_index()
+    return result[out_cols]
+
+def overlay_for_tickers(
+    prices: Dict[str, Union[PriceArrays, pd.DataFrame]],
+    events: pd.DataFrame,
+) -> Dict[str, pd.DataFrame]:
+    """Overlay frames for many tickers; one searchsorted pass per ticker."""
+    return {t: overlay_events(p, events_for_ticker(events, t)) for t, p in prices.items()}
+
+def overlay_to_chart(
+    overlay: pd.DataFrame,
+) -> Tuple[List[str], List[float], List[List[str]], List[Optional[float]]]:
+    """Flatten an overlay frame into the list form ``build_chart_html`` takes."""
+    dates = [d.strftime("%Y-%m-%d") for d in pd.to_datetime(overlay["date"])]
+    prices = [float(x) for x in overlay["price"]]
+    labels = [[f"{ty}: {ti}" if ty else ti for ti, ty in zip(tis, tys)]
+              for tis, tys in zip(overlay["titles"], overlay["types"])]
+    moves = [None if pd.isna(x) else float(x) for x in overlay["move"]]
+    return dates, prices, labels, moves
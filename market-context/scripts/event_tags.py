@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Rule-based impact tagging for fetched events.
+Tags come from the ImpactTag vocabulary in src/types/company.ts.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List
+
+# Vocabulary order from src/types/company.ts (DIRECT_IMPACT_TAGS + INDIRECT_IMPACT_TAGS);
+# classified tags are emitted in this order
+TAG_ORDER = [
+    "Tech", "AI", "Semis", "Gaming", "DataCenter", "Automotive", "Robotics", "Healthcare", "Finance",
+    "Bonds", "Rates", "USD", "Broad Market", "Materials", "Financials", "Housing", "Energy", "Manufacturing",
+]
+
+# Keyword phrases (case-insensitive, whole words) -> tags they imply
+TAG_KEYWORDS: Dict[str, List[str]] = {
+    "Tech": ["technology", "tech", "software", "cloud", "platform"],
+    "AI": ["ai", "artificial intelligence", "generative", "inference", "llm", "machine learning",
+           "blackwell", "rubin", "cuda"],
+    "Semis": ["semiconductor", "semiconductors", "chip", "chips", "gpu", "gpus", "wafer", "foundry",
+              "tsmc", "blackwell", "rubin", "export controls"],
+    "Gaming": ["gaming", "geforce", "rtx", "game", "games"],
+    "DataCenter": ["data center", "data centers", "datacenter", "hyperscaler", "hyperscalers", "dgx", "hgx"],
+    "Automotive": ["automotive", "autonomous", "self-driving", "vehicle", "vehicles"],
+    "Robotics": ["robotics", "robot", "robots", "humanoid", "isaac", "jetson"],
+    "Healthcare": ["healthcare", "health care", "medical", "biotech", "drug", "fda", "medicare", "medicaid"],
+    "Finance": ["fintech", "banking", "payments", "brokerage"],
+    "Bonds": ["treasury", "treasuries", "bond", "bonds", "auction", "yield", "yields"],
+    "Rates": ["fomc", "fed", "federal reserve", "interest rate", "rate decision", "rate cut", "rate hike",
+              "yield", "yields"],
+    "USD": ["dollar", "usd", "currency", "fx"],
+    "Broad Market": ["fomc", "federal reserve", "cpi", "inflation", "payrolls", "jobs report", "gdp",
+                     "treasury auction", "tariff", "tariffs"],
+    "Materials": ["steel", "aluminum", "copper", "rare earth", "rare earths", "materials", "tariff", "tariffs"],
+    "Financials": ["bank", "banks", "lender", "lenders", "mortgage"],
+    "Housing": ["housing", "home sales", "housing starts", "mortgage"],
+    "Energy": ["oil", "gas", "energy", "opec", "crude", "power grid"],
+    "Manufacturing": ["manufacturing", "factory", "factories", "pmi", "ism", "tariff", "tariffs"],
+}
+
+# Tags implied by eventType alone (same sets the fetchers used to hard-code)
+EVENT_TYPE_TAGS: Dict[str, List[str]] = {
+    "FOMC": ["Bonds", "Rates", "Broad Market"],
+    "Treasury Auction": ["Bonds", "Rates", "Broad Market"],
+    "Tariff": ["Materials", "Manufacturing", "Broad Market"],
+    "MacroPrint": ["Broad Market"],
+}
+
+# Base sector tag per company
+TICKER_TAGS: Dict[str, List[str]] = {
+    "NVDA": ["Tech"],
+    "AAPL": ["Tech"],
+    "TSLA": ["Tech", "Automotive"],
+    "HOOD": ["Finance"],
+    "META": ["Tech"],
+    "AMZN": ["Tech"],
+    "UNH": ["Healthcare"],
+}
+
+
+class TagClassifier:
+    """Compile all keyword rules into one regex and classify events in a single pass each.
+
+    Cost per event is one scan of its title + notes, independent of how many
+    tags or keywords are in the vocabulary.
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]] = TAG_KEYWORDS,
+                 event_type_tags: Dict[str, List[str]] = EVENT_TYPE_TAGS,
+                 ticker_tags: Dict[str, List[str]] = TICKER_TAGS,
+                 tag_order: List[str] = TAG_ORDER):
+        self.event_type_tags = event_type_tags
+        self.ticker_tags = ticker_tags
+        self.rank = {tag: i for i, tag in enumerate(tag_order)}
+
+        # keyword -> set of tags; one keyword can feed several tags
+        self.keyword_tags: Dict[str, set] = {}
+        for tag, words in keywords.items():
+            for word in words:
+                self.keyword_tags.setdefault(word.lower(), set()).add(tag)
+
+        # Longest first so "data center" wins over "data"-style prefixes. A
+        # trailing hyphen still ends a word ("AI-driven"); a leading one does not
+        # ("non-tech")
+        alternation = "|".join(re.escape(w) for w in sorted(self.keyword_tags, key=len, reverse=True))
+        self.pattern = re.compile(rf"(?<![\w-])(?:{alternation})(?!\w)", re.IGNORECASE)
+
+        # The scan is non-overlapping, so a compound match hides the keywords
+        # inside it ("treasury auction" hides "treasury"). Give every compound
+        # the tags of the keywords it contains, too.
+        for word in self.keyword_tags:
+            for inner in self.keyword_tags:
+                if inner != word and re.search(rf"(?<![\w-]){re.escape(inner)}(?!\w)", word):
+                    self.keyword_tags[word] = self.keyword_tags[word] | self.keyword_tags[inner]
+
+    def classify_text(self, text: str) -> set:
+        tags = set()
+        for match in self.pattern.finditer(text):
+            tags |= self.keyword_tags[match.group(0).lower()]
+        return tags
+
+    def classify(self, event: Dict[str, Any]) -> List[str]:
+        tags = set(event.get("tags") or [])
+        tags.update(self.ticker_tags.get(str(event.get("ticker", "")).upper(), []))
+        tags.update(self.event_type_tags.get(event.get("eventType", ""), []))
+        tags |= self.classify_text(f"{event.get('title', '')}\n{event.get('notes', '')}")
+        return sorted(tags, key=lambda t: (self.rank.get(t, len(self.rank)), t))
+
+    def tag_events(self, events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Set ``tags`` on every event in place (existing tags are kept) and return them."""
+        events = list(events)
+        for event in events:
+            event["tags"] = self.classify(event)
+        return events
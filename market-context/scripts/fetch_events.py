@@ -7,21 +7,36 @@ Fetches events from multiple sources and updates the JSON data files.
 import argparse
 import json
 import logging
+import os
 import re
+import socket
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
 from dateutil import parser as date_parser
 
+from event_tags import TagClassifier
+from work_queue import WorkQueue, file_lock
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Changelog compaction kicks in once it holds this many entries and more than
+# twice as many as there are live events
+CHANGELOG_COMPACT_MIN = 2000
+
+# Fetch sources a work-queue job can name; "ir" is company-specific, the rest are macro
+SOURCES = ["ir", "fomc", "treasury", "ustr"]
+
 class EventFetcher:
     def __init__(self, data_dir: str = "src/data"):
         self.data_dir = Path(data_dir)
@@ -30,6 +45,11 @@ class EventFetcher:
             'User-Agent': 'Mozilla/5.0 (compatible; MarketContext/1.0; +https://example.com/bot)'
         })
         self.added_this_run = []  # Track events added in this run
+        self.tagger = TagClassifier()
+        # Whole-feed pages (IR RSS, FOMC calendar) are downloaded once per fetcher
+        # and filtered per date window, instead of once per window
+        self.feeds: Dict[str, bytes] = {}
+        self.feed_lock = threading.Lock()
     
     def slugify(self, text: str) -> str:
         """Convert text to a URL-safe slug."""
@@ -48,24 +68,39 @@ class EventFetcher:
         event["source"] = source
         return event
     
-    def fetch_nvda_ir_events(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """Fetch events from NVIDIA IR page."""
+    def get_feed(self, url: str) -> bytes:
+        """Download a page once and reuse it for every window. Errors are not cached."""
+        with self.feed_lock:
+            if url not in self.feeds:
+                response = self.session.get(url, timeout=10)
+                response.raise_for_status()
+                self.feeds[url] = response.content
+            return self.feeds[url]
+    
+    def clear_feeds(self) -> None:
+        """Drop cached pages so the next fetch sees fresh data."""
+        with self.feed_lock:
+            self.feeds.clear()
+    
+    def fetch_nvda_ir_events(self, start_date: str, end_date: str,
+                             strict: bool = False) -> List[Dict[str, Any]]:
+        """Fetch events from NVIDIA IR page. With ``strict``, download errors are raised."""
         events = []
         try:
-            # Try to find IR events page or RSS feed
+            # RSS feed only. The events page (https://ir.nvidia.com/events-and-presentations)
+            # has no parser yet; fetching it only to discard it would let its outages fail
+            # strict windows and jobs
             ir_urls = [
-                "https://ir.nvidia.com/events-and-presentations",
                 "https://ir.nvidia.com/rss/news-releases.xml"
             ]
             
             for url in ir_urls:
                 try:
-                    response = self.session.get(url, timeout=10)
-                    response.raise_for_status()
+                    content = self.get_feed(url)
                     
                     if url.endswith('.xml'):
                         # Parse RSS feed
-                        soup = BeautifulSoup(response.content, 'xml')
+                        soup = BeautifulSoup(content, 'xml')
                         items = soup.find_all('item')
                         
                         for item in items:
@@ -85,7 +120,7 @@ class EventFetcher:
                                             "eventType": "Conference",
                                             "isBinary": False,
                                             "isRecurring": "episodic",
-                                            "tags": ["Tech", "AI", "Semis"],
+                                            "tags": [],  # filled by TagClassifier
                                             "direct": True,
                                             "links": [link.text] if link else [],
                                             "notes": "NVIDIA IR event"
@@ -96,62 +131,67 @@ class EventFetcher:
                                     logger.warning(f"Error parsing RSS item: {e}")
                     else:
                         # Parse HTML page
-                        soup = BeautifulSoup(response.content, 'html.parser')
+                        soup = BeautifulSoup(content, 'html.parser')
                         # Look for event listings - this would need to be customized based on actual page structure
                         logger.info("HTML parsing not implemented yet for IR page")
                         
                 except Exception as e:
+                    if strict:
+                        raise
                     logger.warning(f"Error fetching from {url}: {e}")
                     continue
                     
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error fetching NVIDIA IR events: {e}")
         
         return events
     
-    def fetch_fomc_events(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """Fetch FOMC meeting dates."""
+    def fetch_fomc_events(self, start_date: str, end_date: str,
+                          strict: bool = False) -> List[Dict[str, Any]]:
+        """Fetch FOMC meeting dates. With ``strict``, download errors are raised."""
         events = []
         try:
             url = "https://www.federalreserve.gov/monetarypolicy/fomccalendars.htm"
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(self.get_feed(url), 'html.parser')
             
             # Look for FOMC meeting dates in the HTML
             # This is a simplified parser - would need to be more robust
-            date_pattern = r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+2025\b'
+            date_pattern = r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+(?:19|20)\d{2}\b'
             
-            for text in soup.get_text():
-                matches = re.findall(date_pattern, text)
-                for match in matches:
-                    try:
-                        event_date = date_parser.parse(match).strftime('%Y-%m-%d')
-                        if start_date <= event_date <= end_date:
-                            event = {
-                                "id": f"fomc_{event_date.replace('-', '_')}",
-                                "eventType": "FOMC",
-                                "title": "FOMC Meeting",
-                                "date": event_date,
-                                "time": "14:00 ET",
-                                "isBinary": True,
-                                "isRecurring": "fixed",
-                                "tags": ["Bonds", "Rates", "Broad Market"],
-                                "notes": "Federal Open Market Committee meeting and press conference",
-                                "links": [url]
-                            }
-                            event = self.add_metadata(event, "FOMC")
-                            events.append(event)
-                    except Exception as e:
-                        logger.warning(f"Error parsing FOMC date {match}: {e}")
-                        
+            seen = set()
+            for match in re.findall(date_pattern, soup.get_text()):
+                try:
+                    event_date = date_parser.parse(match).strftime('%Y-%m-%d')
+                    if start_date <= event_date <= end_date and event_date not in seen:
+                        seen.add(event_date)
+                        event = {
+                            "id": f"fomc_{event_date.replace('-', '_')}",
+                            "eventType": "FOMC",
+                            "title": "FOMC Meeting",
+                            "date": event_date,
+                            "time": "14:00 ET",
+                            "isBinary": True,
+                            "isRecurring": "fixed",
+                            "tags": ["Bonds", "Rates", "Broad Market"],
+                            "notes": "Federal Open Market Committee meeting and press conference",
+                            "links": [url]
+                        }
+                        event = self.add_metadata(event, "FOMC")
+                        events.append(event)
+                except Exception as e:
+                    logger.warning(f"Error parsing FOMC date {match}: {e}")
+                    
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error fetching FOMC events: {e}")
         
         return events
     
-    def fetch_treasury_auctions(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    def fetch_treasury_auctions(self, start_date: str, end_date: str,
+                                strict: bool = False) -> List[Dict[str, Any]]:
         """Fetch Treasury auction dates."""
         events = []
         try:
@@ -182,11 +222,14 @@ class EventFetcher:
                     events.append(event)
                     
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error fetching Treasury auctions: {e}")
         
         return events
     
-    def fetch_ustr_tariff_actions(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    def fetch_ustr_tariff_actions(self, start_date: str, end_date: str,
+                                  strict: bool = False) -> List[Dict[str, Any]]:
         """Fetch USTR tariff actions."""
         events = []
         try:
@@ -195,6 +238,8 @@ class EventFetcher:
             logger.info("USTR tariff monitoring not implemented yet")
             
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error fetching USTR actions: {e}")
         
         return events
@@ -214,7 +259,7 @@ class EventFetcher:
                     "eventType": event["eventType"],
                     "isBinary": event["isBinary"],
                     "isRecurring": event["isRecurring"],
-                    "tags": event["tags"] + ["Tech"],
+                    "tags": list(event["tags"]),  # ticker/content tags added by TagClassifier
                     "direct": False,
                     "links": event.get("links", []),
                     "notes": f"Macro event impact on NVDA: {event.get('notes', '')}"
@@ -242,12 +287,18 @@ class EventFetcher:
         events_file = self.data_dir / "company" / f"{ticker.lower()}_events.json"
         events_file.parent.mkdir(parents=True, exist_ok=True)
         
+        # Diff against what is on disk before overwriting it
+        previous_events = self.load_existing_events(ticker)
+        
         # Sort events by date
         events.sort(key=lambda x: x["date"])
         
         with open(events_file, 'w') as f:
             json.dump(events, f, indent=2)
         
+        # Record adds/updates/removals in the changelog
+        self.record_changes(ticker, previous_events, events)
+        
         # Save recently added events
         self.save_recently_added(ticker)
         
@@ -274,6 +325,181 @@ class EventFetcher:
         
         logger.info(f"Saved {len(lightweight_added)} recently added events to {added_file}")
     
+    def collect_source(self, ticker: str, source: str, start_date: str, end_date: str,
+                       strict: bool = False) -> List[Dict[str, Any]]:
+        """Fetch and tag one source's events for a date range without touching disk.
+        
+        With ``strict``, a failed download raises instead of returning no events,
+        so callers can tell "nothing in this window" apart from "fetch failed".
+        """
+        if source == "ir":
+            # Fetch company-specific events
+            events = self.fetch_nvda_ir_events(start_date, end_date, strict) if ticker.upper() == "NVDA" else []
+        else:
+            # Fetch macro events and convert them to company events
+            fetch = {
+                "fomc": self.fetch_fomc_events,
+                "treasury": self.fetch_treasury_auctions,
+                "ustr": self.fetch_ustr_tariff_actions,
+            }[source]
+            events = self.create_nvda_company_events(fetch(start_date, end_date, strict))
+        
+        # Tag the batch in one pass
+        return self.tagger.tag_events(events)
+    
+    def collect_events(self, ticker: str, start_date: str, end_date: str,
+                       strict: bool = False) -> List[Dict[str, Any]]:
+        """Fetch company and macro events for a date range without touching disk."""
+        events = []
+        for source in SOURCES:
+            events.extend(self.collect_source(ticker, source, start_date, end_date, strict))
+        return events
+    
+    def merge_events(self, all_events: List[Dict[str, Any]], existing_ids: set,
+                     new_events: List[Dict[str, Any]]) -> int:
+        """Append events whose id is not yet known. Returns the number added."""
+        added = 0
+        for event in new_events:
+            if event["id"] not in existing_ids:
+                all_events.append(event)
+                existing_ids.add(event["id"])
+                self.added_this_run.append(event)
+                added += 1
+        return added
+    
+    def merge_and_save(self, ticker: str, new_events: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Reload, merge and save under the ticker's file lock.
+        
+        The lock is shared by every process using the same data dir, so
+        concurrent runs never overwrite each other's additions.
+        Returns (added, total).
+        """
+        with file_lock(self.data_dir / "company" / f"{ticker.lower()}_events.lock"):
+            all_events = self.load_existing_events(ticker)
+            existing_ids = {event["id"] for event in all_events}
+            added = self.merge_events(all_events, existing_ids, new_events)
+            self.save_events(ticker, all_events)
+        return added, len(all_events)
+    
+    def changelog_files(self, ticker: str) -> Tuple[Path, Path]:
+        """Changelog (JSON Lines) and its meta file ({"cursor", "floor", "entries"})."""
+        base = self.data_dir / "company" / f"{ticker.lower()}_events_changes"
+        return base.with_suffix(".jsonl"), base.with_name(base.name + "_meta.json")
+    
+    def load_changelog_meta(self, ticker: str) -> Dict[str, int]:
+        _, meta_file = self.changelog_files(ticker)
+        if meta_file.exists():
+            try:
+                with open(meta_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Error loading changelog meta: {e}")
+        return {"cursor": 0, "floor": 0, "entries": 0}
+    
+    def save_changelog_meta(self, ticker: str, meta: Dict[str, int]) -> None:
+        _, meta_file = self.changelog_files(ticker)
+        tmp_file = meta_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(meta, f, indent=2)
+        tmp_file.replace(meta_file)
+    
+    def record_changes(self, ticker: str, previous_events: List[Dict[str, Any]],
+                       events: List[Dict[str, Any]]) -> int:
+        """Append add/update/remove entries for the difference between two snapshots.
+        
+        Every entry gets the next sequence number (the cursor). add/update carry
+        the full event so consumers never need to reload the events file.
+        A log started on top of existing events has no entries for them, so its
+        first cursor is a floor: consumers starting from 0 get reset and reload.
+        Returns the number of entries written.
+        """
+        previous = {event["id"]: event for event in previous_events}
+        current = {event["id"]: event for event in events}
+        
+        changes = []
+        for event_id, event in current.items():
+            if event_id not in previous:
+                changes.append(("add", event_id, event))
+            elif previous[event_id] != event:
+                changes.append(("update", event_id, event))
+        for event_id in previous:
+            if event_id not in current:
+                changes.append(("remove", event_id, None))
+        if not changes:
+            return 0
+        
+        changelog_file, meta_file = self.changelog_files(ticker)
+        meta = self.load_changelog_meta(ticker)
+        if not meta_file.exists() and previous:
+            meta["cursor"] = meta["floor"] = 1
+        now = datetime.utcnow().isoformat() + "Z"
+        with open(changelog_file, 'a') as f:
+            for op, event_id, event in changes:
+                meta["cursor"] += 1
+                entry = {"seq": meta["cursor"], "op": op, "id": event_id, "at": now}
+                if event is not None:
+                    entry["event"] = event
+                f.write(json.dumps(entry) + "\n")
+        meta["entries"] += len(changes)
+        self.save_changelog_meta(ticker, meta)
+        logger.info(f"Recorded {len(changes)} changes (cursor {meta['cursor']})")
+        
+        if meta["entries"] > max(CHANGELOG_COMPACT_MIN, 2 * len(current)):
+            self.compact_changelog(ticker)
+        return len(changes)
+    
+    def read_changelog(self, ticker: str) -> List[Dict[str, Any]]:
+        changelog_file, _ = self.changelog_files(ticker)
+        if not changelog_file.exists():
+            return []
+        with open(changelog_file, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    
+    def compact_changelog(self, ticker: str) -> None:
+        """Keep only the latest add/update per event and drop removals.
+        
+        Sequence numbers are preserved, and "update" is an upsert, so replaying
+        the compacted log from any cursor >= floor gives the same state. The
+        floor moves up to the newest dropped removal; consumers behind it must
+        reload the full events file.
+        """
+        changelog_file, _ = self.changelog_files(ticker)
+        meta = self.load_changelog_meta(ticker)
+        latest: Dict[str, Dict[str, Any]] = {}
+        for entry in self.read_changelog(ticker):
+            latest[entry["id"]] = entry
+        
+        kept = sorted((e for e in latest.values() if e["op"] != "remove"), key=lambda e: e["seq"])
+        # Superseded adds/updates are covered by the later upsert; only dropped removals lose information
+        dropped = [e["seq"] for e in latest.values() if e["op"] == "remove"]
+        
+        tmp_file = changelog_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, 'w') as f:
+            for entry in kept:
+                f.write(json.dumps(entry) + "\n")
+        
+        # Raise the floor before the removals disappear, so a reader never sees
+        # the compacted log with the old floor
+        if dropped:
+            meta["floor"] = max(meta["floor"], max(dropped))
+        meta["entries"] = len(kept)
+        self.save_changelog_meta(ticker, meta)
+        tmp_file.replace(changelog_file)
+        logger.info(f"Compacted changelog for {ticker} to {len(kept)} entries (floor {meta['floor']})")
+    
+    def changes_since(self, ticker: str, cursor: int) -> Dict[str, Any]:
+        """Changes after ``cursor``. ``reset`` means the caller is behind the
+        compaction floor and must reload the full events file instead."""
+        _, meta_file = self.changelog_files(ticker)
+        if not meta_file.exists():
+            # No log yet: anything already on disk has to come from the events file
+            return {"cursor": 0, "reset": bool(self.load_existing_events(ticker)), "changes": []}
+        meta = self.load_changelog_meta(ticker)
+        if cursor < meta["floor"]:
+            return {"cursor": meta["cursor"], "reset": True, "changes": []}
+        changes = [e for e in self.read_changelog(ticker) if e["seq"] > cursor]
+        return {"cursor": meta["cursor"], "reset": False, "changes": changes}
+    
     def fetch_events(self, ticker: str, start_date: str, end_date: str) -> None:
         """Main method to fetch and save events."""
         logger.info(f"Fetching events for {ticker} from {start_date} to {end_date}")
@@ -281,49 +507,178 @@ class EventFetcher:
         # Reset added events tracking
         self.added_this_run = []
         
-        # Load existing events
-        existing_events = self.load_existing_events(ticker)
-        existing_ids = {event["id"] for event in existing_events}
-        
-        # Fetch new events
-        all_events = existing_events.copy()
-        
-        # Fetch company-specific events
-        if ticker.upper() == "NVDA":
-            company_events = self.fetch_nvda_ir_events(start_date, end_date)
-            for event in company_events:
-                if event["id"] not in existing_ids:
-                    all_events.append(event)
-                    existing_ids.add(event["id"])
-                    self.added_this_run.append(event)
-        
-        # Fetch macro events
-        macro_events = []
-        macro_events.extend(self.fetch_fomc_events(start_date, end_date))
-        macro_events.extend(self.fetch_treasury_auctions(start_date, end_date))
-        macro_events.extend(self.fetch_ustr_tariff_actions(start_date, end_date))
-        
-        # Convert macro events to company events
-        company_macro_events = self.create_nvda_company_events(macro_events)
-        for event in company_macro_events:
-            if event["id"] not in existing_ids:
-                all_events.append(event)
-                existing_ids.add(event["id"])
-                self.added_this_run.append(event)
+        # Fetch new events, then merge with existing ones and save
+        added, total = self.merge_and_save(ticker, self.collect_events(ticker, start_date, end_date))
+        
+        logger.info(f"Total events: {total} (added {added} new)")
+    
+    @staticmethod
+    def split_windows(start_date: str, end_date: str, window_days: int) -> List[Tuple[str, str]]:
+        """Split an inclusive YYYY-MM-DD range into consecutive windows."""
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        windows = []
+        while start <= end:
+            window_end = min(start + timedelta(days=window_days - 1), end)
+            windows.append((start.strftime('%Y-%m-%d'), window_end.strftime('%Y-%m-%d')))
+            start = window_end + timedelta(days=1)
+        return windows
+    
+    def checkpoint_file(self, ticker: str) -> Path:
+        return self.data_dir / "company" / f"{ticker.lower()}_backfill_checkpoint.json"
+    
+    def load_checkpoint(self, ticker: str) -> set:
+        """Return the set of window keys ("start:end") already completed."""
+        checkpoint_file = self.checkpoint_file(ticker)
+        if checkpoint_file.exists():
+            try:
+                with open(checkpoint_file, 'r') as f:
+                    return set(json.load(f).get("completed", []))
+            except Exception as e:
+                logger.warning(f"Error loading backfill checkpoint: {e}")
+        return set()
+    
+    def save_checkpoint(self, ticker: str, completed: set) -> None:
+        checkpoint_file = self.checkpoint_file(ticker)
+        checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = checkpoint_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({"ticker": ticker.upper(), "completed": sorted(completed)}, f, indent=2)
+        tmp_file.replace(checkpoint_file)
+    
+    def backfill_events(self, ticker: str, start_date: str, end_date: str,
+                        window_days: int = 90, max_workers: int = 4) -> bool:
+        """Fetch a long range as parallel date windows, checkpointing each one.
         
-        # Save updated events
-        self.save_events(ticker, all_events)
+        Windows listed in the checkpoint are skipped, so a restarted run only
+        fetches what is left. Each finished window is merged and written in one
+        go before it is checkpointed. Sources are fetched strictly: a window is
+        only checkpointed when every source downloaded, otherwise it is left for
+        the next run. Returns True when every window completed.
+        """
+        windows = self.split_windows(start_date, end_date, window_days)
+        completed = self.load_checkpoint(ticker)
+        pending = [w for w in windows if f"{w[0]}:{w[1]}" not in completed]
+        logger.info(f"Backfilling {ticker} from {start_date} to {end_date}: "
+                    f"{len(windows)} windows, {len(windows) - len(pending)} already done")
         
-        logger.info(f"Total events: {len(all_events)} (added {len(self.added_this_run)} new)")
+        self.added_this_run = []
+        failed = 0
+        
+        # Fetching runs in worker threads; merging, writing and checkpointing stay on this thread
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(self.collect_events, ticker, w[0], w[1], True): w for w in pending}
+            for future in as_completed(futures):
+                window_start, window_end = futures[future]
+                try:
+                    window_events = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Window {window_start}..{window_end} failed: {e}")
+                    continue
+                
+                added, _ = self.merge_and_save(ticker, window_events)
+                completed.add(f"{window_start}:{window_end}")
+                self.save_checkpoint(ticker, completed)
+                logger.info(f"Window {window_start}..{window_end} done (added {added} new)")
+        
+        logger.info(f"Backfill finished: {len(pending) - failed}/{len(pending)} windows, "
+                    f"added {len(self.added_this_run)} new events")
+        return failed == 0
+    
+    def enqueue_jobs(self, queue: WorkQueue, ticker: str, start_date: str, end_date: str,
+                     window_days: int = 90, sources: Optional[List[str]] = None) -> int:
+        """Queue one job per (source, window) for a ticker. Returns the number of new jobs."""
+        windows = self.split_windows(start_date, end_date, window_days)
+        added = queue.enqueue(ticker, sources or SOURCES, windows)
+        logger.info(f"Queued {added} new jobs for {ticker} ({len(windows)} windows)")
+        return added
+    
+    def run_worker(self, queue: WorkQueue, worker_id: str, lease_seconds: float = 300,
+                   exit_when_empty: bool = True, poll_seconds: float = 10) -> int:
+        """Claim and run queued jobs. Returns jobs completed.
+        
+        Exits once the queue is empty, or with ``exit_when_empty=False`` polls
+        every ``poll_seconds`` (dropping cached feeds while idle). Sources are
+        fetched strictly, so a download error fails the job and it is retried
+        up to the queue's max_attempts. A background thread renews the lease
+        every lease_seconds / 3. If a renewal fails, another worker has taken
+        the job over, and this worker drops its results instead of writing them.
+        """
+        done = 0
+        while True:
+            job = queue.claim(worker_id, lease_seconds)
+            if job is None:
+                if exit_when_empty:
+                    break
+                self.clear_feeds()
+                time.sleep(poll_seconds)
+                continue
+            
+            label = f"{job['ticker']}/{job['source']} {job['window_start']}..{job['window_end']}"
+            stop, lost = threading.Event(), threading.Event()
+            
+            def beat():
+                while not stop.wait(lease_seconds / 3):
+                    if not queue.heartbeat(job["id"], worker_id, lease_seconds):
+                        lost.set()
+                        return
+            
+            heartbeat = threading.Thread(target=beat, daemon=True)
+            heartbeat.start()
+            try:
+                events = self.collect_source(job["ticker"], job["source"], job["window_start"],
+                                             job["window_end"], strict=True)
+                if lost.is_set():
+                    logger.warning(f"Lost lease on {label}; discarding results")
+                    continue
+                self.added_this_run = []
+                added, _ = self.merge_and_save(job["ticker"], events)
+                if queue.complete(job["id"], worker_id):
+                    done += 1
+                logger.info(f"[{worker_id}] {label} done (added {added} new)")
+            except Exception as e:
+                logger.error(f"[{worker_id}] {label} failed: {e}")
+                queue.fail(job["id"], worker_id, str(e))
+            finally:
+                stop.set()
+                heartbeat.join()
+        
+        logger.info(f"[{worker_id}] Queue drained: {done} jobs completed, status {queue.counts()}")
+        return done
 
 def main():
     parser = argparse.ArgumentParser(description='Fetch events for company calendars')
-    parser.add_argument('--ticker', required=True, help='Company ticker (e.g., NVDA)')
-    parser.add_argument('--start', required=True, help='Start date (YYYY-MM-DD)')
-    parser.add_argument('--end', required=True, help='End date (YYYY-MM-DD)')
+    parser.add_argument('--ticker', help='Company ticker (e.g., NVDA)')
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD)')
     parser.add_argument('--data-dir', default='src/data', help='Data directory path')
+    parser.add_argument('--backfill', action='store_true',
+                        help='Fetch the range in resumable, checkpointed date windows')
+    parser.add_argument('--window-days', type=int, default=90, help='Backfill window size in days')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent backfill windows')
+    parser.add_argument('--enqueue', action='store_true',
+                        help='Queue (ticker, source, window) jobs instead of fetching')
+    parser.add_argument('--worker', action='store_true', help='Run queued jobs until the queue is empty')
+    parser.add_argument('--poll', action='store_true',
+                        help='With --worker, keep polling for new jobs instead of exiting when idle')
+    parser.add_argument('--poll-seconds', type=float, default=10, help='Idle poll interval for --poll')
+    parser.add_argument('--queue-db', help='Work queue database (default: <data-dir>/fetch_queue.sqlite3)')
+    parser.add_argument('--worker-id', default=f"{socket.gethostname()}-{os.getpid()}",
+                        help='Worker name recorded on claimed jobs')
+    parser.add_argument('--lease-seconds', type=float, default=300, help='Job lease length')
     
     args = parser.parse_args()
+    queue_db = Path(args.queue_db) if args.queue_db else Path(args.data_dir) / "fetch_queue.sqlite3"
+    
+    if args.worker:
+        fetcher = EventFetcher(args.data_dir)
+        fetcher.run_worker(WorkQueue(queue_db), args.worker_id, args.lease_seconds,
+                           exit_when_empty=not args.poll, poll_seconds=args.poll_seconds)
+        return
+    
+    if not (args.ticker and args.start and args.end):
+        parser.error("--ticker, --start and --end are required unless --worker is given")
     
     # Validate dates
     try:
@@ -335,7 +690,13 @@ def main():
     
     # Fetch events
     fetcher = EventFetcher(args.data_dir)
-    fetcher.fetch_events(args.ticker, args.start, args.end)
+    if args.enqueue:
+        fetcher.enqueue_jobs(WorkQueue(queue_db), args.ticker, args.start, args.end, args.window_days)
+    elif args.backfill:
+        if not fetcher.backfill_events(args.ticker, args.start, args.end, args.window_days, args.workers):
+            sys.exit(1)
+    else:
+        fetcher.fetch_events(args.ticker, args.start, args.end)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Multi-process test for the sharded fetch workers.
+Runs several worker processes against one queue with the network stubbed out,
+then checks that every job finished and no event was lost or duplicated.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add the scripts directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from fetch_events import EventFetcher, SOURCES
+from work_queue import WorkQueue
+
+class StubFetcher(EventFetcher):
+    """One event per (source, window); the first attempt at every third window fails."""
+
+    def collect_source(self, ticker: str, source: str, start_date: str, end_date: str,
+                       strict: bool = False) -> List[Dict[str, Any]]:
+        marker = self.data_dir / "attempts" / f"{source}_{start_date}"
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        first_attempt = not marker.exists()
+        marker.touch()
+        if first_attempt and int(start_date[8:]) % 3 == 0:
+            raise RuntimeError(f"simulated download error for {source} {start_date}")
+        return [{
+            "id": f"{ticker.lower()}_{source}_{start_date}",
+            "ticker": ticker.upper(),
+            "title": f"{source} {start_date}",
+            "date": start_date,
+            "eventType": "Test",
+            "tags": [],
+        }]
+
+def run_worker(data_dir: str, queue_db: str, worker_id: str) -> None:
+    StubFetcher(data_dir).run_worker(WorkQueue(Path(queue_db)), worker_id, lease_seconds=30)
+
+def test_expired_lease_limit(tmp: Path) -> None:
+    """An expired job that used up max_attempts is failed, not handed out again."""
+    print("\n1. Testing expired lease after max attempts...")
+    queue = WorkQueue(tmp / "limit.sqlite3", max_attempts=1)
+    queue.enqueue("NVDA", ["fomc"], [("2025-01-01", "2025-01-01")])
+    assert queue.claim("dead-worker", lease_seconds=-1) is not None
+    assert queue.claim("next-worker", lease_seconds=30) is None
+    assert queue.counts() == {"failed": 1}, queue.counts()
+    print("  - expired job marked failed")
+
+def test_workers(tmp: Path, workers: int, days: int) -> None:
+    print(f"\n2. Testing {workers} worker processes...")
+    data_dir = tmp / "data"
+    queue_db = tmp / "queue.sqlite3"
+    fetcher = StubFetcher(str(data_dir))
+    queue = WorkQueue(queue_db)
+    jobs = fetcher.enqueue_jobs(queue, "NVDA", "2025-01-01", f"2025-01-{days:02d}", window_days=1)
+
+    # A worker that died holding a job: its lease is already expired
+    assert queue.claim("dead-worker", lease_seconds=-1) is not None
+
+    procs = [multiprocessing.Process(target=run_worker, args=(str(data_dir), str(queue_db), f"w{i}"))
+             for i in range(workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs), [p.exitcode for p in procs]
+
+    counts = queue.counts()
+    assert counts == {"done": jobs}, counts
+    print(f"  - {jobs} jobs done")
+
+    events = fetcher.load_existing_events("NVDA")
+    ids = [event["id"] for event in events]
+    expected = {f"nvda_{source}_2025-01-{day:02d}" for source in SOURCES for day in range(1, days + 1)}
+    assert len(ids) == len(set(ids)), "duplicate events"
+    assert set(ids) == expected, expected ^ set(ids)
+    print(f"  - {len(ids)} events, none lost or duplicated")
+
+    seqs = [entry["seq"] for entry in fetcher.read_changelog("NVDA")]
+    assert seqs == sorted(set(seqs)), "changelog sequence numbers out of order"
+    assert fetcher.changes_since("NVDA", 0)["reset"] is False
+    print(f"  - changelog cursor {seqs[-1]}, sequence strictly increasing")
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-process work queue test')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--days', type=int, default=20, help='One-day windows to queue (max 31)')
+    args = parser.parse_args()
+
+    print("Testing work queue...")
+    with tempfile.TemporaryDirectory(prefix="work_queue_test_") as tmp:
+        test_expired_lease_limit(Path(tmp))
+        test_workers(Path(tmp), args.workers, args.days)
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed work queue for sharded event fetching.
+Workers claim (ticker, source, window) jobs under a lease, heartbeat while
+running, and expired leases are handed to the next worker that asks.
+
+The queue (WAL mode) and file_lock (flock) rely on local-filesystem locking:
+run every worker on the host that owns the data directory, not over NFS/SMB.
+"""
+
+import fcntl
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker       TEXT NOT NULL,
+    source       TEXT NOT NULL,
+    window_start TEXT NOT NULL,
+    window_end   TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',   -- pending | running | done | failed
+    worker       TEXT,
+    lease_until  REAL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    error        TEXT,
+    updated_at   REAL NOT NULL,
+    UNIQUE (ticker, source, window_start, window_end)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, lease_until);
+"""
+
+
+class WorkQueue:
+    def __init__(self, db_path: Path, max_attempts: int = 3):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection; isolation_level=None so BEGIN IMMEDIATE is explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, ticker: str, sources: List[str], windows: List[Tuple[str, str]]) -> int:
+        """Add one job per (source, window). Jobs that already exist are left alone."""
+        now = time.time()
+        rows = [(ticker.upper(), source, start, end, now) for source in sources for start, end in windows]
+        with self.connect() as conn:
+            before = conn.total_changes
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (ticker, source, window_start, window_end, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+            return conn.total_changes - before
+
+    def claim(self, worker: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest pending job, or one whose lease expired.
+        
+        An expired job that has already used max_attempts is marked failed
+        instead of being handed out again.
+        """
+        now = time.time()
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            expired = conn.execute(
+                "UPDATE jobs SET status = 'failed', lease_until = NULL, "
+                "error = COALESCE(error, 'lease expired'), updated_at = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)).rowcount
+            if expired:
+                logger.warning(f"{expired} job(s) failed: lease expired after {self.max_attempts} attempts")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' "
+                "OR (status = 'running' AND lease_until < ?) ORDER BY id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            if row["status"] == "running":
+                logger.warning(f"Job {row['id']} lease from {row['worker']} expired; taking over")
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker, now + lease_seconds, now, row["id"]))
+            conn.execute("COMMIT")
+            job = dict(row)
+            job["worker"] = worker
+            return job
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float) -> bool:
+        """Extend the lease. False means the job is no longer ours."""
+        now = time.time()
+        with self.connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (now + lease_seconds, now, job_id, worker))
+            return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker: str) -> bool:
+        with self.connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'done', lease_until = NULL, error = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time(), job_id, worker))
+            return cur.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> None:
+        """Return the job to the queue, or mark it failed after max_attempts."""
+        with self.connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_until = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (self.max_attempts, error, time.time(), job_id, worker))
+
+    def counts(self) -> Dict[str, int]:
+        with self.connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+            return {row["status"]: row["n"] for row in rows}
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """Exclusive advisory lock shared by every process that opens the same path."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
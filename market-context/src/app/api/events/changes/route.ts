@@ -0,0 +1,50 @@
+import { NextRequest, NextResponse } from 'next/server';
+import fs from 'fs';
+import path from 'path';
+
+// Delta feed over src/data/company/<ticker>_events_changes.jsonl (written by scripts/fetch_events.py).
+// GET /api/events/changes?ticker=NVDA&since=42 -> { cursor, reset, changes }
+// reset=true means `since` is below the floor (the last compaction, or events that predate the log);
+// reload <ticker>_events.json instead.
+export async function GET(request: NextRequest) {
+  const { searchParams } = new URL(request.url);
+  const ticker = searchParams.get('ticker');
+  const since = Number(searchParams.get('since') ?? '0');
+
+  if (!ticker || !/^[A-Za-z.]+$/.test(ticker) || !Number.isFinite(since)) {
+    return NextResponse.json(
+      { error: 'ticker and numeric since parameters are required' },
+      { status: 400 }
+    );
+  }
+
+  const base = path.join(process.cwd(), 'src/data/company', `${ticker.toLowerCase()}_events_changes`);
+
+  try {
+    if (!fs.existsSync(`${base}_meta.json`)) {
+      // No log yet: anything already on disk has to come from the events file
+      const eventsFile = path.join(process.cwd(), 'src/data/company', `${ticker.toLowerCase()}_events.json`);
+      const existing = fs.existsSync(eventsFile) ? JSON.parse(fs.readFileSync(eventsFile, 'utf8')) : [];
+      return NextResponse.json({ cursor: 0, reset: existing.length > 0, changes: [] });
+    }
+    const meta = JSON.parse(fs.readFileSync(`${base}_meta.json`, 'utf8'));
+    if (since < meta.floor) {
+      return NextResponse.json({ cursor: meta.cursor, reset: true, changes: [] });
+    }
+
+    const changes = fs
+      .readFileSync(`${base}.jsonl`, 'utf8')
+      .split('\n')
+      .filter(line => line.trim())
+      .map(line => JSON.parse(line))
+      .filter(entry => entry.seq > since);
+
+    return NextResponse.json({ cursor: meta.cursor, reset: false, changes });
+  } catch (error) {
+    console.error('Error reading event changelog:', error);
+    return NextResponse.json(
+      { error: 'Failed to read event changes' },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# Panel analytics: return matrices + blocked, process-parallel correlation across a ticker universe
+from __future__ import annotations
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import price_store
+from price_arrays import PriceArrays
+
+# ---------- CONFIG ----------
+BLOCK = 512              # tickers per block; a block pair needs ~6 * T * BLOCK * 4 bytes
+MIN_OVERLAP = 10         # shared observations a pair needs for a correlation (else NaN)
+ROLLING_WINDOW = 63      # trading days (~3 months)
+ROLLING_STEP = 21
+EVENT_PRE, EVENT_POST = 2, 3   # trading days around each event bar
+# ----------------------------
+
+@dataclass(frozen=True)
+class ReturnPanel:
+    dates: np.ndarray        # datetime64[D], bar dates of the returns (T,)
+    tickers: List[str]       # (N,)
+    returns: np.ndarray      # float32 (T, N) log returns, NaN where a ticker has no bar
+
+    def column(self, ticker: str) -> int:
+        return self.tickers.index(ticker.upper())
+
+def build_return_panel(prices: Dict[str, Union[PriceArrays, pd.DataFrame]]) -> ReturnPanel:
+    """Align closes on the union of dates and take log returns (float32)."""
+    tickers = [t.upper() for t in prices]
+    series: List[Tuple[np.ndarray, np.ndarray]] = []
+    for p in prices.values():
+        if isinstance(p, pd.DataFrame):
+            p = PriceArrays.from_frame(p, "Close")
+        series.append((p.datetimes(), p.close))
+
+    dates = np.unique(np.concatenate([d for d, _ in series])) if series else np.array([], "datetime64[D]")
+    closes = np.full((len(dates), len(tickers)), np.nan, dtype=np.float32)
+    for j, (d, c) in enumerate(series):
+        closes[np.searchsorted(dates, d), j] = c
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets = np.diff(np.log(closes), axis=0).astype(np.float32)
+    return ReturnPanel(dates[1:], tickers, rets)
+
+def load_panel(
+    tickers: Iterable[str],
+    start: date,
+    end_inclusive: date,
+    store_dir: Path = price_store.PRICE_STORE_DIR,
+    **pool_kwargs,
+) -> ReturnPanel:
+    """Read from the shared price store where it covers the range, else fetch via yf_pool."""
+    tickers = [t.upper() for t in tickers]
+    prices: Dict[str, Union[PriceArrays, pd.DataFrame]] = {}
+    missing = []
+    for t in tickers:
+        if price_store.covers(t, start, end_inclusive, store_dir):
+            prices[t] = price_store.read_arrays(t, start, end_inclusive, "Close", store_dir)
+        else:
+            missing.append(t)
+    if missing:
+        from yf_pool import fetch_many
+        for t, r in fetch_many(missing, start, end_inclusive, earnings=False, **pool_kwargs).items():
+            if r.ok:
+                prices[t] = r.history
+            else:
+                print(f"✖ {t}: {r.errors}")
+    return build_return_panel({t: prices[t] for t in tickers if t in prices})
+
+def standardize(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Demeaned, unit-variance columns and their observed mask, both (N, T) float32.
+
+    Transposed so ticker blocks are contiguous. Missing returns are 0 in the
+    first matrix and 0 in the mask. Correlation ignores a per-column shift and
+    scale, so this only conditions the float32 products; the pairwise
+    statistics are taken over each pair's overlap in ``_corr_block``.
+    """
+    missing = np.isnan(returns)
+    n = np.maximum(returns.shape[0] - missing.sum(axis=0), 1)
+    x = np.where(missing, 0, returns).astype(np.float64)
+    mean = x.sum(axis=0) / n
+    x = np.where(missing, 0, x - mean)
+    sd = np.sqrt((x * x).sum(axis=0) / n)
+    x /= np.where(sd > 0, sd, 1)
+    zt = np.ascontiguousarray(x.T, dtype=np.float32)
+    mt = np.ascontiguousarray(~missing.T, dtype=np.float32)
+    return zt, mt
+
+# Worker state: each process maps the standardized (N, T) matrix, its mask and the output once
+_ZT: Optional[np.ndarray] = None
+_MT: Optional[np.ndarray] = None
+_OUT: Optional[np.ndarray] = None
+_MIN_OVERLAP = MIN_OVERLAP
+
+def _init_worker(z_path: str, m_path: str, out_path: str, min_overlap: int) -> None:
+    global _ZT, _MT, _OUT, _MIN_OVERLAP
+    _ZT = np.load(z_path, mmap_mode="r")
+    _MT = np.load(m_path, mmap_mode="r")
+    _OUT = np.load(out_path, mmap_mode="r+")
+    _MIN_OVERLAP = min_overlap
+
+def _corr_block(i0: int, i1: int, j0: int, j1: int) -> None:
+    """Pairwise-complete Pearson correlation for one block pair.
+
+    Every sum runs over the rows both tickers observed (mask products), so a
+    missing bar neither drags a pair towards 0 nor mixes in the other
+    ticker's unmatched days. Blocks with no missing bars take the single
+    product fast path.
+    """
+    x, y = np.asarray(_ZT[i0:i1]), np.asarray(_ZT[j0:j1])
+    mx, my = np.asarray(_MT[i0:i1]), np.asarray(_MT[j0:j1])
+    sxy = (x @ y.T).astype(np.float64)
+    if mx.all() and my.all():
+        n = np.full(sxy.shape, float(x.shape[1]))
+        sx = sy = 0.0
+        sxx = np.broadcast_to((x * x).sum(axis=1, dtype=np.float64)[:, None], sxy.shape)
+        syy = np.broadcast_to((y * y).sum(axis=1, dtype=np.float64)[None, :], sxy.shape)
+    else:
+        n = (mx @ my.T).astype(np.float64)
+        sx = (x @ my.T).astype(np.float64)
+        sy = (mx @ y.T).astype(np.float64)
+        sxx = ((x * x) @ my.T).astype(np.float64)
+        syy = (mx @ (y * y).T).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nn = np.maximum(n, 1)
+        cov = sxy - sx * sy / nn
+        vx = sxx - sx * sx / nn
+        vy = syy - sy * sy / nn
+        ok = (n >= _MIN_OVERLAP) & (vx > 0) & (vy > 0)
+        block = np.where(ok, np.clip(cov / np.sqrt(vx * vy), -1, 1), np.nan).astype(np.float32)
+    _OUT[i0:i1, j0:j1] = block
+    if i0 != j0:
+        _OUT[j0:j1, i0:i1] = block.T
+
+def _block_pairs(n: int, block: int) -> List[Tuple[int, int, int, int]]:
+    edges = list(range(0, n, block)) + [n]
+    spans = list(zip(edges[:-1], edges[1:]))
+    return [(a0, a1, b0, b1) for k, (a0, a1) in enumerate(spans) for (b0, b1) in spans[k:]]
+
+def correlation_matrix(
+    returns: np.ndarray,
+    block: int = BLOCK,
+    workers: Optional[int] = None,
+    out_path: Optional[Path] = None,
+    min_overlap: int = MIN_OVERLAP,
+) -> np.ndarray:
+    """N×N float32 correlation of the columns of a (T, N) return matrix.
+
+    Each pair uses only the bars where both tickers have a return; pairs
+    sharing fewer than ``min_overlap`` bars (or flat over the overlap) are NaN.
+    Upper-triangle blocks are computed by a process pool. Workers read
+    memory-mapped copies of the standardized matrix and its mask and write
+    straight into a memory-mapped result, so each process holds only two
+    ticker blocks at a time. With ``out_path`` the result stays on disk as a
+    read-only memmap; otherwise it is loaded into memory and the temp files
+    are removed.
+    """
+    zt, mt = standardize(returns)
+    n = zt.shape[0]
+    workers = workers or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory(prefix="panel_corr_") as tmp:
+        z_path = os.path.join(tmp, "z.npy")
+        m_path = os.path.join(tmp, "m.npy")
+        np.save(z_path, zt)
+        np.save(m_path, mt)
+        del zt, mt
+        target = str(out_path) if out_path is not None else os.path.join(tmp, "corr.npy")
+        np.lib.format.open_memmap(target, mode="w+", dtype=np.float32, shape=(n, n)).flush()
+
+        pairs = _block_pairs(n, block)
+        if workers == 1 or len(pairs) == 1:
+            _init_worker(z_path, m_path, target, min_overlap)
+            for pair in pairs:
+                _corr_block(*pair)
+            _OUT.flush()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(z_path, m_path, target, min_overlap)) as pool:
+                list(pool.map(_corr_block, *zip(*pairs), chunksize=max(1, len(pairs) // (4 * workers))))
+
+        if out_path is not None:
+            return np.load(target, mmap_mode="r")
+        return np.array(np.load(target, mmap_mode="r"))
+
+def rolling_correlations(
+    panel: ReturnPanel,
+    window: int = ROLLING_WINDOW,
+    step: int = ROLLING_STEP,
+    **kwargs,
+) -> Iterator[Tuple[np.datetime64, np.ndarray]]:
+    """Yield (window end date, N×N correlation) one window at a time."""
+    for end in range(window, len(panel.dates) + 1, step):
+        yield panel.dates[end - 1], correlation_matrix(panel.returns[end - window:end], **kwargs)
+
+def event_window_rows(panel: ReturnPanel, event_dates: Iterable, pre: int = EVENT_PRE,
+                      post: int = EVENT_POST) -> np.ndarray:
+    """Row indices of the bars within [-pre, +post] of each event (deduplicated)."""
+    ev = np.asarray(pd.to_datetime(list(event_dates)).values.astype("datetime64[D]"))
+    pos = np.searchsorted(panel.dates, ev, side="left")
+    pos = pos[pos < len(panel.dates)]
+    rows = (pos[:, None] + np.arange(-pre, post + 1)[None, :]).ravel()
+    return np.unique(rows[(rows >= 0) & (rows < len(panel.dates))])
+
+def event_window_correlation(panel: ReturnPanel, event_dates: Iterable, pre: int = EVENT_PRE,
+                             post: int = EVENT_POST, **kwargs) -> np.ndarray:
+    """N×N correlation using only the bars around the events (co-movement on event days)."""
+    return correlation_matrix(panel.returns[event_window_rows(panel, event_dates, pre, post)], **kwargs)
+
+def top_comovers(panel: ReturnPanel, corr: np.ndarray, ticker: str, top: int = 20) -> pd.Series:
+    """Names most correlated with ``ticker`` in a correlation matrix (self excluded)."""
+    j = panel.column(ticker)
+    row = np.asarray(corr[j], dtype=np.float64).copy()
+    row[j] = np.nan
+    order = np.argsort(-np.nan_to_num(row, nan=-np.inf))[:top]
+    return pd.Series(row[order], index=[panel.tickers[k] for k in order], name=f"corr_{ticker.upper()}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Compact price arrays for the chart pipeline: int32 day offsets + float32 closes
+from __future__ import annotations
+import io
+import math
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+@dataclass(frozen=True)
+class PriceArrays:
+    base: date             # day 0
+    days: np.ndarray       # int32 offsets from base, ascending
+    close: np.ndarray      # float32, same length as days
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @classmethod
+    def from_dates(cls, dates: np.ndarray, close: np.ndarray) -> "PriceArrays":
+        """Build from datetime64 dates (any unit) and a close array; copies only if dtypes differ.
+
+        Bars without a finite close are dropped (a copy only when there are any).
+        """
+        d = np.asarray(dates).astype("datetime64[D]")
+        close = np.asarray(close)
+        finite = np.isfinite(close)
+        if not finite.all():
+            d, close = d[finite], close[finite]
+        base = d[0] if len(d) else _EPOCH
+        days = (d - base).astype(np.int32)
+        return cls(base.astype(date), days, close.astype(np.float32, copy=False))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str = "Close") -> "PriceArrays":
+        idx = pd.DatetimeIndex(df.index)
+        if idx.tz is not None:
+            idx = idx.tz_localize(None)
+        return cls.from_dates(idx.values, df[column].to_numpy())
+
+    def datetimes(self) -> np.ndarray:
+        """datetime64[D] per bar (for searchsorted joins)."""
+        return np.datetime64(self.base, "D") + self.days
+
+def js_number_array(arr: np.ndarray, fmt: str = "%.2f", chunk: int = 256) -> str:
+    """JS array literal from a NumPy array, formatted in small chunks.
+
+    Only ``chunk`` Python numbers exist at a time, so peak memory stays close to
+    the size of the output string instead of a full float list + json.dumps.
+    Non-finite values are written as ``null`` ("nan" is not a JS literal).
+    """
+    buf = io.StringIO()
+    buf.write("[")
+    for i in range(0, len(arr), chunk):
+        if i:
+            buf.write(",")
+        buf.write(",".join([fmt % x if math.isfinite(x) else "null" for x in arr[i:i + chunk].tolist()]))
+    buf.write("]")
+    return buf.getvalue()
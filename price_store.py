@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# Shared on-disk price store: fixed-width .npy columns per ticker, opened read-only via mmap
+from __future__ import annotations
+import argparse
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from price_arrays import PriceArrays
+
+# ---------- CONFIG ----------
+PRICE_STORE_DIR = Path("price_store")
+INDEX_FILE = "index.json"
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")   # float32; Volume stays float64 (exact past 2**24)
+# ----------------------------
+#
+# Layout:
+#   price_store/index.json           {"UNH": {"rows", "start", "end", "fetchedStart", "fetchedEnd", "columns"}}
+#   price_store/UNH/dates.npy        datetime64[D], sorted ascending
+#   price_store/UNH/<Column>.npy     float32 prices / float64 Volume, same length as dates
+#
+# Readers np.load(..., mmap_mode="r"), so every process maps the same page-cache
+# pages instead of holding its own DataFrame copy.
+
+@dataclass(frozen=True)
+class PriceSeries:
+    ticker: str
+    dates: np.ndarray                 # datetime64[D], read-only memmap
+    columns: Dict[str, np.ndarray]    # column -> read-only memmap (float32 prices, float64 Volume)
+
+    def slice(self, start: Optional[date] = None, end_inclusive: Optional[date] = None) -> "PriceSeries":
+        """Zero-copy view of the rows in [start, end_inclusive]."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        hi = len(self.dates) if end_inclusive is None else int(
+            np.searchsorted(self.dates, np.datetime64(end_inclusive, "D"), side="right"))
+        return PriceSeries(self.ticker, self.dates[lo:hi], {k: v[lo:hi] for k, v in self.columns.items()})
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """DataFrame whose columns are the mapped arrays themselves (no copy).
+
+        Only the date index is materialized (8 bytes per row). The columns stay
+        read-only views on the files, so writes to the frame need a ``.copy()``.
+        """
+        cols = list(columns) if columns is not None else list(self.columns)
+        index = pd.DatetimeIndex(self.dates.astype("datetime64[ns]"), name="Date")
+        return pd.DataFrame({c: self.columns[c] for c in cols}, index=index, copy=False)
+
+def load_index(store_dir: Path = PRICE_STORE_DIR) -> Dict[str, dict]:
+    path = store_dir / INDEX_FILE
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+def _write_index(store_dir: Path, index: Dict[str, dict]) -> None:
+    tmp = store_dir / f"{INDEX_FILE}.tmp"
+    tmp.write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, store_dir / INDEX_FILE)
+
+def write_prices(
+    ticker: str,
+    df: pd.DataFrame,
+    fetched_start: date,
+    fetched_end: date,
+    store_dir: Path = PRICE_STORE_DIR,
+) -> None:
+    """Write one ticker's frame as fixed-width columns and register it in the index.
+
+    ``fetched_start``/``fetched_end`` record the range that was requested, so a
+    reader can tell "no bars on those days" apart from "never fetched".
+    Columns are written to a temp dir and swapped in, so open readers keep their
+    old mappings until they reopen.
+    """
+    ticker = ticker.upper()
+    idx = pd.to_datetime(df.index)
+    if getattr(idx, "tz", None) is not None:
+        idx = idx.tz_localize(None)
+    order = np.argsort(idx.values, kind="stable")
+    cols = [c for c in COLUMNS if c in df.columns]
+
+    final_dir = store_dir / ticker
+    tmp_dir = store_dir / f".{ticker}.tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    np.save(tmp_dir / "dates.npy", idx.values.astype("datetime64[D]")[order])
+    for c in cols:
+        dtype = np.float32 if c in PRICE_COLUMNS else np.float64
+        np.save(tmp_dir / f"{c}.npy", df[c].to_numpy(dtype=dtype)[order])
+
+    old_dir = store_dir / f".{ticker}.old"
+    if final_dir.exists():
+        os.replace(final_dir, old_dir)
+    os.replace(tmp_dir, final_dir)
+    if old_dir.exists():
+        for f in old_dir.iterdir():
+            f.unlink()
+        old_dir.rmdir()
+
+    index = load_index(store_dir)
+    dates = idx.values.astype("datetime64[D]")
+    index[ticker] = {
+        "rows": int(len(df)),
+        "start": str(dates.min()) if len(dates) else None,
+        "end": str(dates.max()) if len(dates) else None,
+        "fetchedStart": fetched_start.isoformat(),
+        "fetchedEnd": fetched_end.isoformat(),
+        "columns": cols,
+    }
+    _write_index(store_dir, index)
+
+def covers(ticker: str, start: date, end_inclusive: date, store_dir: Path = PRICE_STORE_DIR) -> bool:
+    """True if the store holds ``ticker`` fetched over at least [start, end_inclusive]."""
+    entry = load_index(store_dir).get(ticker.upper())
+    if not entry or not entry.get("rows"):
+        return False
+    return (date.fromisoformat(entry["fetchedStart"]) <= start
+            and date.fromisoformat(entry["fetchedEnd"]) >= end_inclusive)
+
+def open_prices(ticker: str, store_dir: Path = PRICE_STORE_DIR) -> PriceSeries:
+    """Map a ticker's columns read-only. Raises KeyError if it is not in the store."""
+    ticker = ticker.upper()
+    entry = load_index(store_dir).get(ticker)
+    if entry is None:
+        raise KeyError(f"{ticker} not in price store {store_dir}")
+    base = store_dir / ticker
+    dates = np.load(base / "dates.npy", mmap_mode="r")
+    columns = {c: np.load(base / f"{c}.npy", mmap_mode="r") for c in entry["columns"]}
+    return PriceSeries(ticker, dates, columns)
+
+def read_prices(
+    ticker: str,
+    start: date,
+    end_inclusive: date,
+    columns: Optional[Iterable[str]] = None,
+    store_dir: Path = PRICE_STORE_DIR,
+) -> pd.DataFrame:
+    return open_prices(ticker, store_dir).slice(start, end_inclusive).to_frame(columns)
+
+def read_arrays(
+    ticker: str,
+    start: date,
+    end_inclusive: date,
+    column: str = "Close",
+    store_dir: Path = PRICE_STORE_DIR,
+) -> PriceArrays:
+    """Day offsets + float32 closes; the close array is a view on the mapped file."""
+    s = open_prices(ticker, store_dir).slice(start, end_inclusive)
+    return PriceArrays.from_dates(s.dates, s.columns[column])
+
+def main() -> None:
+    import yfinance as yf
+
+    parser = argparse.ArgumentParser(description="Fill the shared price store from yfinance")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--start", default="2024-01-01", help="YYYY-MM-DD")
+    parser.add_argument("--end", default=date.today().isoformat(), help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--store", default=str(PRICE_STORE_DIR))
+    args = parser.parse_args()
+
+    start, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    for t in args.tickers:
+        df = yf.Ticker(t).history(start=start.isoformat(), end=(end + timedelta(days=1)).isoformat(),
+                                  auto_adjust=True)
+        if df.empty:
+            print(f"✖ {t}: no data returned from yfinance.")
+            continue
+        write_prices(t, df, start, end, Path(args.store))
+        print(f"✅ {t}: {len(df)} rows")
+
+if __name__ == "__main__":
+    main()
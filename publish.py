@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# Publish generated HTML/JSON: minify, content-hash names, gzip/brotli variants, manifest + size report
+from __future__ import annotations
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import brotli  # in requirements.txt; pass --no-brotli to publish without it
+except ImportError:
+    brotli = None
+
+# ---------- CONFIG ----------
+DEFAULT_ARTIFACTS = [
+    Path("UNH_stock_chart.html"),
+    Path("UNH_stock_analysis.html"),
+]
+PUBLISH_DIR = Path("dist")
+MANIFEST_NAME = "manifest.json"
+HASH_LEN = 12
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+# ----------------------------
+
+@dataclass
+class Published:
+    source: str
+    file: str
+    sha256: str
+    cacheControl: str
+    original: int
+    minified: int
+    gzip: int
+    br: Optional[int]
+
+def minify_html(text: str) -> str:
+    """Strip indentation and blank lines.
+
+    Line breaks are kept so ``//`` comments and ASI in inline scripts stay valid.
+    """
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+def minify_json(text: str) -> str:
+    return json.dumps(json.loads(text), separators=(",", ":"), ensure_ascii=False)
+
+def minify(path: Path, text: str) -> str:
+    if path.suffix == ".json":
+        return minify_json(text)
+    if path.suffix in (".html", ".htm"):
+        return minify_html(text)
+    return text
+
+def _write_if_missing(path: Path, data: bytes) -> None:
+    # Hashed names are immutable: identical name means identical bytes
+    if path.exists():
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def publish_file(src: Path, out_dir: Path, with_brotli: bool = True) -> Published:
+    if with_brotli and brotli is None:
+        raise RuntimeError("brotli is not installed (pip install brotli), or publish with --no-brotli.")
+    raw = src.read_bytes()
+    body = minify(src, raw.decode("utf-8")).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()
+    name = f"{src.stem}.{digest[:HASH_LEN]}{src.suffix}"
+
+    gz = gzip.compress(body, compresslevel=9, mtime=0)
+    br = brotli.compress(body, quality=11) if with_brotli else None
+
+    _write_if_missing(out_dir / name, body)
+    _write_if_missing(out_dir / f"{name}.gz", gz)
+    if br is not None:
+        _write_if_missing(out_dir / f"{name}.br", br)
+
+    return Published(src.name, name, digest, CACHE_CONTROL,
+                     len(raw), len(body), len(gz), len(br) if br is not None else None)
+
+def publish(sources: Iterable[Path], out_dir: Path = PUBLISH_DIR,
+            with_brotli: bool = True) -> Dict[str, Published]:
+    """Publish each source and merge the results into ``out_dir/manifest.json``.
+
+    The manifest maps the logical name (e.g. ``UNH_stock_chart.html``) to the
+    hashed file the host should serve. Hashed files can be cached forever; only
+    the manifest needs a short cache lifetime.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest: Dict[str, dict] = {}
+    if manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except Exception:
+            manifest = {}
+
+    results: Dict[str, Published] = {}
+    for src in sources:
+        if not src.exists():
+            print(f"✖ Missing artifact: {src}")
+            continue
+        results[src.name] = publish_file(src, out_dir, with_brotli)
+        manifest[src.name] = asdict(results[src.name])
+
+    tmp = manifest_path.with_name(MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+    return results
+
+def size_report(results: Dict[str, Published]) -> str:
+    def pct(n: Optional[int], base: int) -> str:
+        return "—" if n is None else f"{n:>9,} ({100 * n / base:4.0f}%)"
+
+    rows: List[str] = [f"{'artifact':<40} {'original':>10} {'minified':>17} {'gzip':>17} {'brotli':>17}"]
+    for p in results.values():
+        rows.append(f"{p.file:<40} {p.original:>10,} {pct(p.minified, p.original):>17} "
+                    f"{pct(p.gzip, p.original):>17} {pct(p.br, p.original):>17}")
+    return "\n".join(rows)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish chart/event artifacts for static hosting")
+    parser.add_argument("artifacts", nargs="*", type=Path, default=DEFAULT_ARTIFACTS)
+    parser.add_argument("--out", type=Path, default=PUBLISH_DIR)
+    parser.add_argument("--no-brotli", action="store_true", help="skip .br variants")
+    args = parser.parse_args()
+
+    if brotli is None and not args.no_brotli:
+        parser.error("brotli is not installed (pip install brotli); pass --no-brotli to publish without .br files")
+    results = publish(args.artifacts, args.out, with_brotli=not args.no_brotli)
+    print(size_report(results))
+    print(f"✅ Manifest: {args.out / MANIFEST_NAME}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for yf_pool.FetchPool.
+Runs the pool against a local stand-in for yfinance (no network) and checks
+request de-duplication, per-ticker error isolation, and the rate limit.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from collections import Counter
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from yf_pool import FetchPool
+
+START, END = date(2025, 1, 2), date(2025, 1, 31)
+
+class FakeClient:
+    """yfinance-shaped client: ``Ticker(symbol)`` with ``history`` and ``get_earnings_dates``.
+
+    Every call is counted per (symbol, kind); symbols in ``failing`` raise from history.
+    """
+
+    def __init__(self, delay: float = 0.0, failing: tuple = ()) -> None:
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls = Counter()
+        self.lock = threading.Lock()
+        client = self
+
+        class Ticker:
+            def __init__(self, symbol: str, session=None) -> None:
+                self.symbol = symbol
+
+            def history(self, start: str, end: str, auto_adjust: bool = True) -> pd.DataFrame:
+                client.record(self.symbol, "history")
+                if self.symbol in client.failing:
+                    raise RuntimeError(f"simulated outage for {self.symbol}")
+                idx = pd.bdate_range(start, end, inclusive="left")
+                return pd.DataFrame({"Close": np.linspace(100, 110, len(idx))}, index=idx)
+
+            def get_earnings_dates(self, limit: int = 30) -> pd.DataFrame:
+                client.record(self.symbol, "earnings")
+                return pd.DataFrame(index=pd.to_datetime(["2025-01-15"]))
+
+        self.Ticker = Ticker
+
+    def record(self, symbol: str, kind: str) -> None:
+        with self.lock:
+            self.calls[(symbol, kind)] += 1
+        time.sleep(self.delay)
+
+def test_dedupe() -> None:
+    print("\n1. Testing identical in-flight requests...")
+    client = FakeClient(delay=0.2)
+    pool = FetchPool(rate=100, burst=10, client=client)
+
+    async def run():
+        return await asyncio.gather(*(pool.history("AAA", START, END) for _ in range(5)))
+
+    frames = asyncio.run(run())
+    assert client.calls[("AAA", "history")] == 1, client.calls
+    assert all(f is frames[0] for f in frames)
+    print("  - 5 concurrent history calls reached the client once")
+
+def test_errors() -> None:
+    print("\n2. Testing per-ticker error isolation...")
+    client = FakeClient(failing=("BAD",))
+    pool = FetchPool(rate=100, burst=10, client=client)
+    results = asyncio.run(pool.fetch_many(["AAA", "BAD", "CCC"], START, END))
+    assert list(results["BAD"].errors) == ["history"], results["BAD"].errors
+    assert results["BAD"].earnings is not None
+    for t in ("AAA", "CCC"):
+        assert results[t].ok and not results[t].history.empty, results[t].errors
+    print(f"  - BAD: {results['BAD'].errors['history']}; AAA and CCC ok")
+
+def test_rate(requests: int, rate: float) -> None:
+    print(f"\n3. Testing rate limit ({requests} requests at {rate}/s, burst 1)...")
+    client = FakeClient()
+    pool = FetchPool(rate=rate, burst=1, client=client)
+    tickers = [f"T{i}" for i in range(requests)]
+    t0 = time.monotonic()
+    asyncio.run(pool.fetch_many(tickers, START, END, earnings=False))
+    elapsed = time.monotonic() - t0
+    expected = (requests - 1) / rate
+    assert sum(client.calls.values()) == requests, client.calls
+    assert 0.9 * expected <= elapsed <= expected + 0.5, (elapsed, expected)
+    print(f"  - took {elapsed:.2f}s (expected ~{expected:.2f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description='FetchPool test against a fake yfinance client')
+    parser.add_argument('--requests', type=int, default=6)
+    parser.add_argument('--rate', type=float, default=5.0)
+    args = parser.parse_args()
+
+    print("Testing fetch pool...")
+    test_dedupe()
+    test_errors()
+    test_rate(args.requests, args.rate)
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    main()
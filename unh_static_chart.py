@@ -6,31 +6,46 @@ from pathlib import Path
 from datetime import date, timedelta
 from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
+from event_overlay import EVENTS_DIR, load_events, overlay_events, overlay_to_chart
+import chart_build
+import price_store
+from price_arrays import PriceArrays, js_number_array
+
 # ---------- CONFIG ----------
 TICKER = "UNH"
 START_DATE = date(2025, 1, 1)
 LAST_KNOWN = date(2025, 9, 10)
 YEAR_END   = date(2025, 12, 31)
 OUTPUT_HTML = Path(f"{TICKER}_stock_chart.html")
+TEMPLATE_VERSION = "unh_static_chart/3"  # renderer source is hashed too; bump for other output changes
 # ----------------------------
 
-def fetch_stock_data(ticker: str, start: date, end_inclusive: date) -> pd.DataFrame:
+def fetch_stock_data(
+    ticker: str,
+    start: date,
+    end_inclusive: date,
+    store_dir: Path = price_store.PRICE_STORE_DIR,
+    stock: yf.Ticker | None = None,
+) -> PriceArrays:
+    if price_store.covers(ticker, start, end_inclusive, store_dir):
+        prices = price_store.read_arrays(ticker, start, end_inclusive, "Close", store_dir)
+        if len(prices) == 0:
+            raise RuntimeError(f"No {ticker} bars in the price store between {start} and {end_inclusive}.")
+        return prices
     yf_end = end_inclusive + timedelta(days=1)
-    df = yf.Ticker(ticker).history(start=start.isoformat(), end=yf_end.isoformat(), auto_adjust=True)
+    df = (stock or yf.Ticker(ticker)).history(start=start.isoformat(), end=yf_end.isoformat(), auto_adjust=True)
     if df.empty:
         raise RuntimeError("No data returned from yfinance.")
-    df.index = pd.to_datetime(df.index)
-    if getattr(df.index, "tz", None) is not None:
-        df.index = df.index.tz_localize(None)
-    return df[["Close"]].copy()
+    return PriceArrays.from_frame(df, "Close")
 
-def fetch_earnings_dates_2025(ticker: str) -> List[date]:
+def fetch_earnings_dates_2025(ticker: str, stock: yf.Ticker | None = None) -> List[date]:
     dates: List[date] = []
     try:
-        raw = yf.Ticker(ticker).get_earnings_dates(limit=30)
+        raw = (stock or yf.Ticker(ticker)).get_earnings_dates(limit=30)
         if isinstance(raw, pd.DataFrame) and not raw.empty:
             tmp = raw.reset_index().rename(columns={"index": "Date"})
             for d in pd.to_datetime(tmp["Date"], errors="coerce").dropna():
@@ -59,55 +74,57 @@ def quarter_label_for_report_date(d: date) -> str:
     return "Q3"
 
 def align_earnings(  # CHANGED: return $ move instead of %
-    price_df: pd.DataFrame,
+    prices: PriceArrays,
     earnings_days: List[date],
     last_close: float,
 ) -> Tuple[List[str], List[float], List[str], List[float]]:
-    idx = price_df.index
-    closes = price_df["Close"]
-    e_dates, e_prices, e_quarters, e_dollars = [], [], [], []
-    for d in earnings_days:
-        ts = pd.Timestamp(d)
-        p = idx.searchsorted(ts, side="left")
-        if p >= len(idx):
-            earn_price = float(last_close)
-            p = len(idx) - 1
-        else:
-            earn_price = float(closes.iloc[p])
-        prior_idx = max(0, p - 1)
-        prior_price = float(closes.iloc[prior_idx])
-        dollar_move = earn_price - prior_price  # CHANGED
-        e_dates.append(d.isoformat())
-        e_prices.append(earn_price)
-        e_quarters.append(f"{quarter_label_for_report_date(d)} quarter")
-        e_dollars.append(dollar_move)
-    return e_dates, e_prices, e_quarters, e_dollars
+    bars = prices.datetimes()
+    pos = np.searchsorted(bars, np.array(earnings_days, dtype="datetime64[D]"), side="left")
+    future = pos >= len(bars)
+    p = np.minimum(pos, len(bars) - 1)
+    earn = np.where(future, last_close, prices.close[p].astype(np.float64))
+    dollars = earn - prices.close[np.maximum(p - 1, 0)]  # CHANGED
+    e_dates = [d.isoformat() for d in earnings_days]
+    e_quarters = [f"{quarter_label_for_report_date(d)} quarter" for d in earnings_days]
+    return e_dates, earn.tolist(), e_quarters, dollars.tolist()
+
+def script_json(value) -> str:
+    """json.dumps that is safe inside an inline <script>: a title containing
+    ``</script>`` or ``<!--`` cannot end or alter the script block."""
+    return (json.dumps(value)
+            .replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026"))
 
 def build_chart_html(
-    dates: list[str],
-    closes: list[float],
+    prices: PriceArrays,
     last_known: date,
     year_end: date,
     earnings_dates: list[str],
     earnings_prices: list[float],
     earnings_quarters: list[str],
     earnings_dollars: list[float],   # CHANGED
+    event_dates: list[str] | None = None,
+    event_prices: list[float] | None = None,
+    event_labels: list[list[str]] | None = None,
+    event_dollars: list[float | None] | None = None,
 ) -> str:
-    last_px = closes[-1]
-    future_dates = pd.date_range(last_known + timedelta(days=1), year_end, freq="D")
-    future_dates_str = [d.strftime("%Y-%m-%d") for d in future_dates]
-    future_prices = [float(last_px)] * len(future_dates_str)
+    last_px = float(prices.close[-1])
+    # Stub (flat) days are generated in the page from an offset + count
+    stub_start = (last_known - prices.base).days + 1
+    stub_count = max(0, (year_end - last_known).days)
 
-    # JSON
-    json_actual_dates   = json.dumps(dates)
-    json_actual_prices  = json.dumps([float(x) for x in closes])
-    json_future_dates   = json.dumps(future_dates_str)
-    json_future_prices  = json.dumps(future_prices)
-    json_e_dates        = json.dumps(earnings_dates)
-    json_e_prices       = json.dumps([float(x) for x in earnings_prices])
-    json_e_quarters     = json.dumps(earnings_quarters)
-    json_e_dollars      = json.dumps([float(x) for x in earnings_dollars])  # CHANGED
+    # JSON (price arrays are written straight from NumPy: day offsets + closes)
+    js_actual_days      = js_number_array(prices.days, "%d")
+    js_actual_prices    = js_number_array(prices.close, "%.2f")
+    json_e_dates        = script_json(earnings_dates)
+    json_e_prices       = script_json([float(x) for x in earnings_prices])
+    json_e_quarters     = script_json(earnings_quarters)
+    json_e_dollars      = script_json([float(x) for x in earnings_dollars])  # CHANGED
+    json_ev_dates       = script_json(event_dates or [])
+    json_ev_prices      = script_json([float(x) for x in (event_prices or [])])
+    json_ev_labels      = script_json(event_labels or [])
+    json_ev_dollars     = script_json(event_dollars or [])
 
+    # Template is pure ASCII (entities/escapes for symbols) so the page is a 1-byte/char str
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -117,7 +134,7 @@ def build_chart_html(
 <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
 <style>
   :root {{
-    --green:#0a8a0a; --ink:#111; --bg:#fff; --muted:#6b7280; --purple:#6b46c1; --grey:#9ca3af;
+    --green:#0a8a0a; --ink:#111; --bg:#fff; --muted:#6b7280; --purple:#6b46c1; --grey:#9ca3af; --amber:#d97706;
   }}
   html,body {{ margin:0; padding:0; background:var(--bg); color:var(--ink);
     font:14px/1.45 -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif; }}
@@ -136,22 +153,25 @@ def build_chart_html(
   .tooltip.earn {{ background:#fff; color:var(--ink); border:2px solid var(--purple);
     box-shadow:0 1px 6px rgba(0,0,0,.08); }}
   .legend {{ margin:10px 4px 0; color:var(--muted); font-size:12px; display:flex; gap:12px; align-items:center; }}
-  .legend .dot::before {{ content:'●'; margin-right:6px; }}
+  .legend .dot::before {{ content:'\\25CF'; margin-right:6px; }}
   .legend .actual::before {{ color:var(--green); }}
   .legend .stub::before {{ color:var(--grey); }}
   .legend .earn::before {{ color:var(--purple); }}
+  .legend .event::before {{ color:var(--amber); }}
   .q {{ color:var(--purple); font-weight:600; }}
+  .ev {{ color:var(--amber); font-weight:600; }}
   .up {{ color:#166534; font-weight:600; }}
   .down {{ color:#991b1b; font-weight:600; }}
 </style>
 </head>
 <body>
   <div class="wrap">
-    <h1>💹 {TICKER} — Close Price</h1>
+    <h1>&#x1F4B9; {TICKER} &mdash; Close Price</h1>
     <div class="legend">
       <span class="dot actual">Actual through {last_known:%b %d, %Y}</span>
       <span class="dot stub">No prices yet (flat to Dec 31)</span>
       <span class="dot earn">Earnings dates</span>
+      <span class="dot event">Company / macro events</span>
     </div>
     <div class="chart-box">
       <canvas id="chart"></canvas>
@@ -160,14 +180,20 @@ def build_chart_html(
   </div>
 
 <script>
-  const actualDates    = {json_actual_dates};
-  const actualPrices   = {json_actual_prices};
-  const stubDates      = {json_future_dates};
-  const stubPrices     = {json_future_prices};
+  const baseDay        = Date.UTC({prices.base.year}, {prices.base.month - 1}, {prices.base.day});
+  const dayStr         = o => new Date(baseDay + o * 864e5).toISOString().slice(0, 10);
+  const actualDates    = {js_actual_days}.map(dayStr);
+  const actualPrices   = {js_actual_prices};
+  const stubDates      = Array.from({{length: {stub_count}}}, (_, k) => dayStr({stub_start} + k));
+  const stubPrices     = Array(stubDates.length).fill({last_px:.2f});
   const earningsDates  = {json_e_dates};
   const earningsPrices = {json_e_prices};
   const earningsQuarts = {json_e_quarters};
   const earningsDols   = {json_e_dollars};  // CHANGED ($ move)
+  const eventDates     = {json_ev_dates};
+  const eventPrices    = {json_ev_prices};
+  const eventLabels    = {json_ev_labels};
+  const eventDols      = {json_ev_dollars};
 
   const labels = actualDates.concat(stubDates);
   const labelIndex = new Map(labels.map((d,i)=>[d,i]));
@@ -182,6 +208,16 @@ def build_chart_html(
     }}
   }});
 
+  const eventSeries = Array(labels.length).fill(null);
+  const evMeta = {{}}; // date -> event labels and dollars (null for future bars)
+  eventDates.forEach((d, k) => {{
+    const i = labelIndex.get(d);
+    if (i != null) {{
+      eventSeries[i] = Number(eventPrices[k]);
+      evMeta[d] = {{labels: eventLabels[k], dollars: eventDols[k]}};
+    }}
+  }});
+
   const ctx = document.getElementById('chart').getContext('2d');
   const tooltipEl = document.getElementById('tooltip');
 
@@ -220,6 +256,19 @@ def build_chart_html(
           pointBackgroundColor: '#6b46c1',
           pointBorderColor: '#6b46c1',
           pointBorderWidth: 2,
+        }},
+        {{
+          label: 'Events',
+          data: eventSeries,
+          borderColor: 'transparent',
+          backgroundColor: 'transparent',
+          showLine: false,
+          pointRadius: 5,
+          pointHoverRadius: 7,
+          pointStyle: 'rectRot',
+          pointBackgroundColor: '#d97706',
+          pointBorderColor: '#d97706',
+          pointBorderWidth: 1,
         }}
       ]
     }},
@@ -239,6 +288,25 @@ def build_chart_html(
         }}
         const label = labels[idx];
         const isEarnings = earningsSeries[idx] != null;
+        const isEvent = eventSeries[idx] != null;
+        let eventNodes = null;
+        if (isEvent) {{
+          const ev = evMeta[label] || {{labels:[], dollars:null}};
+          eventNodes = document.createDocumentFragment();
+          for (const t of ev.labels) {{
+            // Titles come from scraped feeds: set as text, never parsed as HTML
+            const row = document.createElement('div');
+            row.className = 'ev';
+            row.textContent = t;
+            eventNodes.appendChild(row);
+          }}
+          if (ev.dollars != null) {{
+            const s = ev.dollars >= 0 ? 'up' : 'down';
+            const row = document.createElement('div');
+            row.innerHTML = `Price <span class="${{s}}">${{s}} $${{Math.abs(ev.dollars).toFixed(2)}}</span>`;
+            eventNodes.appendChild(row);
+          }}
+        }}
 
         if (isEarnings) {{
           const meta = eMeta[label] || {{quarter:'', dollars:0}};
@@ -250,6 +318,11 @@ def build_chart_html(
             <div class="q">${{meta.quarter}}</div>
             <div>Q earnings hit, price <span class="${{sign}}">${{sign}} $${{amt}}</span></div>
           `;
+          if (eventNodes) tooltipEl.appendChild(eventNodes);
+        }} else if (isEvent) {{
+          tooltipEl.classList.add('earn');
+          tooltipEl.innerHTML = `<div>${{label}}</div>`;
+          tooltipEl.appendChild(eventNodes);
         }} else {{
           // CHANGED: normal tracing uses dark tooltip (no purple frame)
           tooltipEl.classList.remove('earn');
@@ -262,7 +335,7 @@ def build_chart_html(
               price = Number(stubPrices[stubIdx]);
             }}
           }}
-          tooltipEl.innerHTML = `${{label}}<br>Close: $${{price?.toFixed(2) ?? '—'}}`;
+          tooltipEl.innerHTML = `${{label}}<br>Close: $${{price?.toFixed(2) ?? '\\u2014'}}`;
         }}
 
         tooltipEl.style.left = (evt.x - rect.left + 6) + 'px';  // CHANGED: closer
@@ -278,20 +351,34 @@ def build_chart_html(
 
 def main() -> None:
     print("UNH Stock Chart with Earnings (custom tooltips)")
+    stock = yf.Ticker(TICKER)  # one Ticker (and session) for prices and earnings
     try:
-        price_df = fetch_stock_data(TICKER, START_DATE, LAST_KNOWN)
+        prices = fetch_stock_data(TICKER, START_DATE, LAST_KNOWN, stock=stock)
     except Exception as e:
         print(f"✖ Error fetching data: {e}")
         return
-    dates = [ts.strftime("%Y-%m-%d") for ts in price_df.index]
-    closes = [float(x) for x in price_df["Close"].tolist()]
-    last_close = closes[-1]
+    last_close = float(prices.close[-1])
+
+    earnings_days = fetch_earnings_dates_2025(TICKER, stock)
+    e_dates, e_prices, e_quarters, e_dollars = align_earnings(prices, earnings_days, last_close)
 
-    earnings_days = fetch_earnings_dates_2025(TICKER)
-    e_dates, e_prices, e_quarters, e_dollars = align_earnings(price_df, earnings_days, last_close)
+    events = load_events(EVENTS_DIR, [TICKER])
+    events = events[events["date"] <= pd.Timestamp(YEAR_END)]
+    ev_dates, ev_prices, ev_labels, ev_dollars = overlay_to_chart(overlay_events(prices, events))
+
+    digest = chart_build.input_hash(
+        TEMPLATE_VERSION, chart_build.source_hash(build_chart_html, script_json, js_number_array),
+        TICKER, LAST_KNOWN, YEAR_END, prices.base, prices.days, prices.close,
+        [e_dates, e_prices, e_quarters, e_dollars], [ev_dates, ev_prices, ev_labels, ev_dollars],
+    )
+    if chart_build.is_up_to_date(OUTPUT_HTML, digest):
+        print(f"⏭  {OUTPUT_HTML.name} unchanged — skipped.")
+        return
 
-    html = build_chart_html(dates, closes, LAST_KNOWN, YEAR_END, e_dates, e_prices, e_quarters, e_dollars)
+    html = build_chart_html(prices, LAST_KNOWN, YEAR_END, e_dates, e_prices, e_quarters, e_dollars,
+                            ev_dates, ev_prices, ev_labels, ev_dollars)
     OUTPUT_HTML.write_text(html, encoding="utf-8")
+    chart_build.record_build(OUTPUT_HTML, digest)
 
     print(f"✅ Wrote: {OUTPUT_HTML.name} — open it in your browser.")
 
@@ -1,18 +1,35 @@
 import yfinance as yf
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import chart_build
+import price_store
+from price_arrays import PriceArrays, js_number_array
 import warnings
 warnings.filterwarnings('ignore')
 
-def get_stock_data():
-    """Fetch United Healthcare stock data"""
+TEMPLATE_VERSION = "united_healthcare_stock/2"  # renderer source is hashed too; bump for other output changes
+
+def get_stock_data(store_dir=price_store.PRICE_STORE_DIR):
+    """Fetch United Healthcare stock data (from the shared price store when it covers the range)"""
     ticker = "UNH"
     start_date = "2024-01-01"
     end_date = datetime.now().strftime("%Y-%m-%d")
     
     print(f"Fetching {ticker} stock data from {start_date} to {end_date}...")
     
+    # yfinance's end is exclusive, so the store only needs to cover through the day before
+    start, end_inclusive = date.fromisoformat(start_date), date.fromisoformat(end_date) - timedelta(days=1)
+    if price_store.covers(ticker, start, end_inclusive, Path(store_dir)):
+        # Columns are read-only views on the mapped store files (no copy)
+        data = price_store.read_prices(ticker, start, end_inclusive, store_dir=Path(store_dir))
+        if data.empty:
+            print("No data available.")
+            return None
+        return data, ticker, start_date, end_date
+    
     try:
         stock = yf.Ticker(ticker)
         data = stock.history(start=start_date, end=end_date, auto_adjust=True)
@@ -20,7 +37,9 @@ def get_stock_data():
         if data.empty:
             print("No data available.")
             return None
-            
+        
+        # Prices in float32 halve those columns; Volume keeps its dtype (float32 rounds past 2**24)
+        data = data.astype({c: np.float32 for c in price_store.PRICE_COLUMNS if c in data.columns})
         return data, ticker, start_date, end_date
         
     except Exception as e:
@@ -32,9 +51,11 @@ def create_chart(data, ticker, start_date, end_date):
     if data is None:
         return
     
-    # Prepare data
-    dates = [date.strftime('%Y-%m-%d') for date in data.index]
-    prices = data['Close'].tolist()
+    # Prepare data: int32 day offsets + float32 closes, written straight into the page
+    arrays = PriceArrays.from_frame(data, 'Close')
+    base = arrays.base
+    day_offsets = js_number_array(arrays.days, '%d')
+    prices = js_number_array(arrays.close, '%.2f')
     
     html_content = f"""
     <!DOCTYPE html>
@@ -102,7 +123,8 @@ def create_chart(data, ticker, start_date, end_date):
 
         <script>
             const stockData = {prices};
-            const dates = {dates};
+            const baseDay = Date.UTC({base.year}, {base.month - 1}, {base.day});
+            const dates = {day_offsets}.map(o => new Date(baseDay + o * 864e5).toISOString().slice(0, 10));
             
             const ctx = document.getElementById('stockChart').getContext('2d');
             const chart = new Chart(ctx, {{
@@ -171,26 +193,32 @@ def main():
     
     if result is not None:
         data, ticker, start_date, end_date = result
+        html_filename = f"{ticker}_stock_chart.html"
         
-        print("Creating chart...")
-        html_content = create_chart(data, ticker, start_date, end_date)
-        
-        if html_content:
-            html_filename = f"{ticker}_stock_chart.html"
+        renderer = chart_build.source_hash(create_chart, PriceArrays, js_number_array)
+        digest = chart_build.input_hash(TEMPLATE_VERSION, renderer, ticker, data['Close'])
+        if chart_build.is_up_to_date(Path(html_filename), digest):
+            print(f"⏭  {html_filename} unchanged — skipped.")
+        else:
+            print("Creating chart...")
+            html_content = create_chart(data, ticker, start_date, end_date)
+            
+            if not html_content:
+                print("Failed to create chart.")
+                return
             with open(html_filename, 'w', encoding='utf-8') as f:
                 f.write(html_content)
+            chart_build.record_build(Path(html_filename), digest)
             
             print(f"✅ Chart created: {html_filename}")
             print(f"📊 Green line with interactive tracing")
             print(f"💻 Open {html_filename} in your browser")
-            
-            # Print summary
-            print(f"\nSUMMARY ({start_date} to {end_date})")
-            print(f"Trading days: {len(data)}")
-            print(f"Latest price: ${data['Close'].iloc[-1]:.2f}")
-            print(f"Price change: ${data['Close'].iloc[-1] - data['Close'].iloc[0]:.2f}")
-        else:
-            print("Failed to create chart.")
+        
+        # Print summary
+        print(f"\nSUMMARY ({start_date} to {end_date})")
+        print(f"Trading days: {len(data)}")
+        print(f"Latest price: ${data['Close'].iloc[-1]:.2f}")
+        print(f"Price change: ${data['Close'].iloc[-1] - data['Close'].iloc[0]:.2f}")
     else:
         print("Failed to retrieve stock data.")
 
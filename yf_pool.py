@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# Rate-limited, de-duplicating yfinance fetch pool for many tickers
+from __future__ import annotations
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+import pandas as pd
+
+# ---------- CONFIG ----------
+RATE_PER_SEC = 2.0       # sustained requests/second across the whole pool
+BURST = 5                # bucket size
+MAX_CONCURRENCY = 8      # requests on the wire at once (worker threads)
+# ----------------------------
+
+class TokenBucket:
+    """Async token bucket shared by every request in a pool."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+@dataclass
+class TickerResult:
+    ticker: str
+    history: Optional[pd.DataFrame] = None
+    earnings: Optional[Any] = None
+    errors: Dict[str, str] = field(default_factory=dict)   # request kind -> message
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+class FetchPool:
+    """Runs yfinance price/earnings requests concurrently under one rate limit.
+
+    ``client`` is anything with a yfinance-style ``Ticker(symbol, session=...)``
+    whose objects expose ``history(...)`` and ``get_earnings_dates(limit=...)``;
+    it defaults to the ``yfinance`` module and can be swapped for a local
+    stand-in. One Ticker object is kept per symbol, and identical requests that
+    are already in flight share a single call.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_PER_SEC,
+        burst: int = BURST,
+        max_concurrency: int = MAX_CONCURRENCY,
+        client: Any = None,
+        session: Any = None,
+    ) -> None:
+        if client is None:
+            import yfinance as client
+        self.client = client
+        self.session = session
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._tickers: Dict[str, Any] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def ticker(self, symbol: str) -> Any:
+        symbol = symbol.upper()
+        if symbol not in self._tickers:
+            if self.session is not None:
+                self._tickers[symbol] = self.client.Ticker(symbol, session=self.session)
+            else:
+                self._tickers[symbol] = self.client.Ticker(symbol)
+        return self._tickers[symbol]
+
+    async def _call(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        existing = self._inflight.get(key)
+        if existing is not None:
+            return await asyncio.shield(existing)
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def run() -> Any:
+            async with self._sem:
+                await self.bucket.acquire()
+                return await asyncio.to_thread(fn)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._inflight.pop(key, None)
+
+    def history(self, symbol: str, start: date, end_inclusive: date) -> Awaitable[pd.DataFrame]:
+        key = ("history", symbol.upper(), start, end_inclusive)
+        yf_end = end_inclusive + timedelta(days=1)
+        return self._call(key, lambda: self.ticker(symbol).history(
+            start=start.isoformat(), end=yf_end.isoformat(), auto_adjust=True))
+
+    def earnings_dates(self, symbol: str, limit: int = 30) -> Awaitable[Any]:
+        key = ("earnings", symbol.upper(), limit)
+        return self._call(key, lambda: self.ticker(symbol).get_earnings_dates(limit=limit))
+
+    async def fetch_many(
+        self,
+        tickers: Iterable[str],
+        start: date,
+        end_inclusive: date,
+        earnings: bool = True,
+    ) -> Dict[str, TickerResult]:
+        """Fetch prices (and earnings) for every ticker; failures are recorded per ticker."""
+        symbols: List[str] = list(dict.fromkeys(t.upper() for t in tickers))
+        results = {t: TickerResult(t) for t in symbols}
+        jobs = []
+        for t in symbols:
+            jobs.append((t, "history", self.history(t, start, end_inclusive)))
+            if earnings:
+                jobs.append((t, "earnings", self.earnings_dates(t)))
+
+        outcomes = await asyncio.gather(*(j[2] for j in jobs), return_exceptions=True)
+        for (t, kind, _), out in zip(jobs, outcomes):
+            if isinstance(out, BaseException):
+                results[t].errors[kind] = f"{type(out).__name__}: {out}"
+            elif kind == "history" and (out is None or getattr(out, "empty", False)):
+                results[t].errors[kind] = "No data returned from yfinance."
+            else:
+                setattr(results[t], kind, out)
+        return results
+
+def fetch_many(
+    tickers: Iterable[str],
+    start: date,
+    end_inclusive: date,
+    earnings: bool = True,
+    **pool_kwargs: Any,
+) -> Dict[str, TickerResult]:
+    """Blocking wrapper around ``FetchPool.fetch_many`` for scripts."""
+    return asyncio.run(FetchPool(**pool_kwargs).fetch_many(tickers, start, end_inclusive, earnings))